@@ -1,8 +1,9 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.compute import run_for_request
 from app.core.database import get_db
 from app.schemas.analytics import (
     AxisStatsResponse,
@@ -10,6 +11,7 @@ from app.schemas.analytics import (
     ConfidenceBucket,
     ConfidenceResponse,
     EmbeddingMapResponse,
+    EmbeddingTileResponse,
     KPIResponse,
 )
 
@@ -44,14 +46,16 @@ async def get_confidence_distribution(
 
 
 @router.get("/axes", response_model=list[AxisStatsResponse])
-async def get_axes_stats(config_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_axes_stats(
+    config_id: UUID, request: Request, db: AsyncSession = Depends(get_db)
+):
     from app.services.analytics.analytics_computation import compute_axes_stats
     from app.services.config.config_management import get_config_with_relations
 
     config = await get_config_with_relations(config_id, db)
     name_to_id = {axis.name: axis.id for axis in config.axes}
 
-    stats = await compute_axes_stats(config_id, db)
+    stats = await run_for_request(request, compute_axes_stats(config_id, db))
     results = []
     for s in stats:
         axis_name = s["axis_name"]
@@ -77,13 +81,34 @@ async def get_axes_stats(config_id: UUID, db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/embeddings", response_model=EmbeddingMapResponse)
-async def get_embedding_map(config_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_embedding_map(
+    config_id: UUID, request: Request, db: AsyncSession = Depends(get_db)
+):
     from app.services.analytics.analytics_computation import compute_embedding_map
 
-    result = await compute_embedding_map(config_id, db)
+    result = await run_for_request(request, compute_embedding_map(config_id, db))
     return EmbeddingMapResponse(points=result)
 
 
+@router.get("/embeddings/tile", response_model=EmbeddingTileResponse)
+async def get_embedding_tile(
+    config_id: UUID,
+    request: Request,
+    zoom: int = Query(default=0, ge=0, le=20),
+    x_min: float | None = None,
+    x_max: float | None = None,
+    y_min: float | None = None,
+    y_max: float | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    from app.services.analytics.analytics_computation import compute_embedding_tile
+
+    result = await run_for_request(request, compute_embedding_tile(
+        config_id, db, zoom=zoom, x_min=x_min, x_max=x_max, y_min=y_min, y_max=y_max
+    ))
+    return EmbeddingTileResponse(**result)
+
+
 @router.get("/classification-matrix", response_model=ClassificationMatrixResponse)
 async def get_classification_matrix(
     config_id: UUID,
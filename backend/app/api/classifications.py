@@ -6,7 +6,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.models.classification_result import ClassificationResult
-from app.schemas.classification import ClassificationListResponse, ClassificationResponse
+from app.schemas.classification import (
+    ClassificationListResponse,
+    ClassificationResponse,
+    ClassificationSearchResponse,
+)
+from app.services.shared.result_filters import category_condition
+from app.services.shared.text_search import matches_search, search_classifications
 
 router = APIRouter(prefix="/api/classifications", tags=["Database Explorer"])
 
@@ -20,6 +26,7 @@ async def list_classifications(
     max_confidence: float | None = Query(default=None, ge=0, le=1),
     was_challenged: bool | None = None,
     search: str | None = Query(default=None, max_length=200),
+    category: list[str] = Query(default=[]),
     db: AsyncSession = Depends(get_db),
 ):
     base_filter = ClassificationResult.config_id == config_id
@@ -32,10 +39,21 @@ async def list_classifications(
     )
 
     if search:
-        search_filter = ClassificationResult.input_text.ilike(f"%{search}%")
+        search_filter = matches_search(search)
         query = query.where(search_filter)
         count_query = count_query.where(search_filter)
 
+    selected: dict[str, list[str]] = {}
+    for value in category:
+        axis_name, _, category_name = value.partition(":")
+        if not axis_name.strip() or not category_name.strip():
+            raise HTTPException(status_code=422, detail=f"Filtre categorie invalide : {value}")
+        selected.setdefault(axis_name.strip(), []).append(category_name.strip())
+    for axis_name, categories in selected.items():
+        axis_filter = category_condition(axis_name, categories)
+        query = query.where(axis_filter)
+        count_query = count_query.where(axis_filter)
+
     if min_confidence is not None:
         query = query.where(ClassificationResult.overall_confidence >= min_confidence)
         count_query = count_query.where(ClassificationResult.overall_confidence >= min_confidence)
@@ -65,6 +83,19 @@ async def list_classifications(
     )
 
 
+@router.get("/search", response_model=ClassificationSearchResponse)
+async def search_classifications_ranked(
+    config_id: UUID,
+    q: str = Query(min_length=1, max_length=200),
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    return await search_classifications(
+        config_id, q, db, limit=page_size, offset=(page - 1) * page_size
+    )
+
+
 @router.get("/{classification_id}", response_model=ClassificationResponse)
 async def get_classification(
     classification_id: UUID, db: AsyncSession = Depends(get_db)
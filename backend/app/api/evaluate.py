@@ -1,7 +1,7 @@
 import json
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sse_starlette.sse import EventSourceResponse
@@ -20,33 +20,112 @@ class GroundTruthRequest(BaseModel):
 
 @router.post("/ground-truth")
 async def run_ground_truth(
-    request: GroundTruthRequest, db: AsyncSession = Depends(get_db)
+    request: GroundTruthRequest,
+    db: AsyncSession = Depends(get_db),
+    last_event_id: str | None = Header(default=None),
 ):
     from app.services.config.config_management import get_config_with_relations
-    from app.services.iterative_ground_truth import run_ground_truth_loop
+    from app.services.iterative_ground_truth import ground_truth_job_manager
 
     try:
-        config = await get_config_with_relations(request.config_id, db)
+        await get_config_with_relations(request.config_id, db)
     except ValueError:
         raise HTTPException(status_code=404, detail="Config non trouvee")
 
-    async def event_generator():
+    job, created = ground_truth_job_manager.start(
+        request.config_id,
+        ticket_count=request.ticket_count,
+        max_rounds=request.max_rounds,
+        target_confidence=request.target_confidence,
+    )
+    return EventSourceResponse(
+        _sse_events(job, None if created else last_event_id), ping=20
+    )
+
+
+@router.get("/ground-truth/jobs")
+async def list_ground_truth_jobs():
+    from app.services.iterative_ground_truth import ground_truth_job_manager
+
+    return ground_truth_job_manager.list_jobs()
+
+
+@router.get("/ground-truth/{run_id}")
+async def get_ground_truth_status(run_id: UUID):
+    from app.services.iterative_ground_truth import (
+        get_ground_truth_run,
+        ground_truth_job_manager,
+    )
+
+    job = ground_truth_job_manager.get(str(run_id))
+    run = await get_ground_truth_run(str(run_id))
+    if job is None and run is None:
+        raise HTTPException(status_code=404, detail="Run non trouve")
+    return {
+        "run_id": str(run_id),
+        "job": job.get_status() if job else None,
+        "checkpoint": run,
+    }
+
+
+@router.get("/ground-truth/{run_id}/events")
+async def stream_ground_truth_events(
+    run_id: UUID, last_event_id: str | None = Header(default=None)
+):
+    from app.services.iterative_ground_truth import ground_truth_job_manager
+
+    job = ground_truth_job_manager.get(str(run_id))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Run non trouve")
+    return EventSourceResponse(_sse_events(job, last_event_id), ping=20)
+
+
+@router.post("/ground-truth/{run_id}/resume")
+async def resume_ground_truth(
+    run_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    last_event_id: str | None = Header(default=None),
+):
+    from app.services.config.config_management import get_config_with_relations
+    from app.services.iterative_ground_truth import (
+        get_ground_truth_run,
+        ground_truth_job_manager,
+    )
+
+    job = ground_truth_job_manager.get(str(run_id))
+    if job is None or not job.is_active:
+        run = await get_ground_truth_run(str(run_id))
+        if run is None:
+            raise HTTPException(status_code=404, detail="Run non trouve")
+        if run["status"] == "done":
+            raise HTTPException(status_code=409, detail="Run deja termine")
+
         try:
-            async for item in run_ground_truth_loop(
-                config=config,
-                db=db,
-                ticket_count=request.ticket_count,
-                max_rounds=request.max_rounds,
-                target_confidence=request.target_confidence,
-            ):
-                yield {
-                    "event": item["type"],
-                    "data": json.dumps(item.get("data", {}), ensure_ascii=False, default=str),
-                }
-        except Exception as exc:
-            yield {
-                "event": "error",
-                "data": json.dumps({"message": f"Erreur interne : {exc}"}, ensure_ascii=False),
-            }
-
-    return EventSourceResponse(event_generator(), ping=20)
+            config = await get_config_with_relations(UUID(run["config_id"]), db)
+        except ValueError:
+            raise HTTPException(status_code=404, detail="Config non trouvee")
+
+        job, created = ground_truth_job_manager.resume(str(run_id), config.id)
+        if created:
+            last_event_id = None
+
+    return EventSourceResponse(_sse_events(job, last_event_id), ping=20)
+
+
+@router.post("/ground-truth/{run_id}/cancel")
+async def cancel_ground_truth(run_id: UUID):
+    from app.services.iterative_ground_truth import ground_truth_job_manager
+
+    job = await ground_truth_job_manager.cancel(str(run_id))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Run non trouve")
+    return job.get_status()
+
+
+async def _sse_events(job, last_event_id: str | None):
+    async for index, item in job.subscribe(job.event_offset(last_event_id)):
+        yield {
+            "id": job.event_id(index),
+            "event": item["type"],
+            "data": json.dumps(item.get("data", {}), ensure_ascii=False, default=str),
+        }
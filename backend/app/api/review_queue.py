@@ -0,0 +1,53 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.schemas.common import MessageResponse
+from app.schemas.feedback import (
+    ReviewClaimRequest,
+    ReviewQueueItemResponse,
+    ReviewReleaseRequest,
+)
+from app.services.learning.review_queue import (
+    claim_review_items,
+    get_priority_queue,
+    release_review_item,
+)
+
+router = APIRouter(prefix="/api/review-queue", tags=["Review Queue"])
+
+
+@router.get("", response_model=list[ReviewQueueItemResponse])
+async def list_review_queue(
+    config_id: UUID,
+    limit: int = Query(default=10, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_priority_queue(config_id, db, limit=limit)
+
+
+@router.post("/claim", response_model=list[ReviewQueueItemResponse])
+async def claim_review_queue(
+    request: ReviewClaimRequest, db: AsyncSession = Depends(get_db)
+):
+    return await claim_review_items(
+        request.config_id,
+        request.reviewer,
+        db,
+        count=request.count,
+        lease_seconds=request.lease_seconds,
+    )
+
+
+@router.post("/{classification_id}/release", response_model=MessageResponse)
+async def release_review_queue_item(
+    classification_id: UUID,
+    request: ReviewReleaseRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    released = await release_review_item(classification_id, request.reviewer, db)
+    if not released:
+        raise HTTPException(status_code=404, detail="Ticket non reserve par ce relecteur")
+    return MessageResponse(message="Ticket remis dans la file")
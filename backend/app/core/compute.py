@@ -0,0 +1,114 @@
+import asyncio
+import multiprocessing
+from collections.abc import Awaitable, Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import partial
+from multiprocessing import shared_memory
+from typing import Any, NamedTuple, TypeVar
+
+from fastapi import HTTPException, Request
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+DISCONNECT_POLL_INTERVAL = 0.5
+
+_executor: ProcessPoolExecutor | None = None
+_slots = asyncio.Semaphore(settings.compute_pool_workers)
+
+
+class SharedArray(NamedTuple):
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.compute_pool_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _recycle_executor(executor: ProcessPoolExecutor) -> None:
+    global _executor
+    if _executor is executor:
+        _executor = None
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+@contextmanager
+def share_array(array) -> Iterator[SharedArray]:
+    import numpy as np
+
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    try:
+        view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+        view[:] = array
+        yield SharedArray(shm.name, array.shape, array.dtype.str)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+@contextmanager
+def attach_array(ref: SharedArray) -> Iterator[Any]:
+    import numpy as np
+
+    shm = shared_memory.SharedMemory(name=ref.name)
+    try:
+        yield np.ndarray(ref.shape, dtype=np.dtype(ref.dtype), buffer=shm.buf)
+    finally:
+        shm.close()
+
+
+async def run_cpu_bound(
+    func: Callable[..., T], *args: Any, timeout: float | None = None
+) -> T:
+    async with _slots:
+        executor = get_executor()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(executor, partial(func, *args))
+        try:
+            return await asyncio.wait_for(future, timeout or settings.compute_job_timeout)
+        except TimeoutError:
+            _recycle_executor(executor)
+            raise
+
+
+async def run_for_request(request: Request, job: Awaitable[T]) -> T:
+    task = asyncio.ensure_future(job)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                raise HTTPException(status_code=499, detail="Client deconnecte")
+    except TimeoutError:
+        raise HTTPException(
+            status_code=504, detail="Calcul trop long, reessayez plus tard"
+        ) from None
+    except BrokenProcessPool:
+        raise HTTPException(
+            status_code=503, detail="Calcul interrompu, reessayez plus tard"
+        ) from None
+    finally:
+        if not task.done():
+            task.cancel()
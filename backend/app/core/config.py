@@ -5,6 +5,13 @@ class Settings(BaseSettings):
     database_url: str
     openai_api_key: str
 
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100
+
     agent_model: str = "gpt-5.1"
     classifier_model: str = "gpt-5-nano"
     challenger_model: str = "gpt-5.1"
@@ -12,12 +19,46 @@ class Settings(BaseSettings):
     generator_model: str = "gpt-4o"
     embedding_model: str = "text-embedding-3-small"
 
+    llm_backend: str = "openai"
+    llm_max_concurrency: int = 16
+    llm_max_retries: int = 6
+    fake_llm_latency_ms: float = 300.0
+    fake_llm_latency_sigma: float = 0.4
+    fake_llm_error_rate: float = 0.0
+    fake_llm_seed: int = 0
+    fake_embedding_latency_ms: float = 20.0
+
     challenger_threshold: float = 0.75
     few_shot_top_k: int = 5
     self_consistency_enabled: bool = True
     self_consistency_n: int = 3
 
+    ground_truth_concurrency: int = 5
+    ground_truth_checkpoint_pool_size: int = 4
+    ground_truth_max_jobs: int = 2
+    ground_truth_job_retention: int = 3600
+    ground_truth_job_max_events: int = 2000
+    ground_truth_reformulation_chunk_size: int = 10
+    ground_truth_reformulation_retries: int = 2
+    ground_truth_judge_shard_size: int = 20
+
     drip_feed_default_interval: int = 10
+    review_lease_seconds: int = 600
+
+    chat_history_token_budget: int = 4000
+    chat_summary_trigger_tokens: int = 1000
+    agent_tool_cache_ttl: float = 30.0
+    semantic_search_ef_search: int = 200
+    semantic_search_iterative_scan: str | None = None
+
+    compute_pool_workers: int = 2
+    compute_job_timeout: float = 120.0
+
+    embedding_map_refit_ratio: float = 0.1
+    embedding_map_refit_seconds: int = 900
+    embedding_map_cache_configs: int = 8
+
+    event_loop_lag_interval: float = 0.5
 
     cors_origins: list[str] = ["http://localhost:3000"]
 
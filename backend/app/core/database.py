@@ -1,10 +1,48 @@
+import time
 from collections.abc import AsyncGenerator
 
+from pgvector.asyncpg import register_vector
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
+from app.core.metrics import DB_POOL_WAIT_SECONDS, count_query
 
-engine = create_async_engine(settings.database_url, pool_pre_ping=True)
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT_SECONDS.observe(time.perf_counter() - started)
+
+
+def _connect_args() -> dict:
+    if settings.db_statement_cache_size > 0:
+        return {"prepared_statement_cache_size": settings.db_statement_cache_size}
+    return {"prepared_statement_cache_size": 0, "statement_cache_size": 0}
+
+
+engine = create_async_engine(
+    settings.database_url,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    connect_args=_connect_args(),
+)
+
+
+def _register_vector_codec(dbapi_connection, connection_record) -> None:
+    dbapi_connection.run_async(register_vector)
+
+
+event.listen(engine.sync_engine, "connect", _register_vector_codec)
+event.listen(engine.sync_engine, "before_cursor_execute", count_query)
 async_session = async_sessionmaker(engine, expire_on_commit=False)
 
 
@@ -0,0 +1,280 @@
+import asyncio
+import hashlib
+import json
+import random
+import time
+import types
+from collections.abc import Sequence
+from itertools import count
+from typing import Any, Union, get_args, get_origin
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+
+EMBEDDING_DIMENSIONS = 1536
+
+
+class FakeLLMError(RuntimeError):
+    pass
+
+
+def _parse_axes(text: str) -> dict[str, list[str]]:
+    axes: dict[str, list[str]] = {}
+    current: list[str] | None = None
+    for line in text.splitlines():
+        if line.startswith("### "):
+            current = axes.setdefault(line[4:].strip(), [])
+        elif current is not None and line.startswith("  - ") and " : " in line:
+            current.append(line[4:].split(" : ", 1)[0].strip())
+    return axes
+
+
+def _parse_json_array(text: str) -> list:
+    decoder = json.JSONDecoder()
+    start = text.find("[")
+    while start != -1:
+        try:
+            value, _ = decoder.raw_decode(text[start:])
+            if isinstance(value, list):
+                return value
+        except ValueError:
+            pass
+        start = text.find("[", start + 1)
+    return []
+
+
+def _default_for(annotation: Any) -> Any:
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        args = get_args(annotation)
+        if type(None) in args:
+            return None
+        annotation = args[0]
+        origin = get_origin(annotation)
+    if origin is list:
+        return []
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _minimal_payload(annotation)
+    return {str: "", int: 0, float: 0.0, bool: False}.get(annotation)
+
+
+def _minimal_payload(schema: type[BaseModel]) -> dict:
+    return {
+        name: _default_for(field.annotation)
+        for name, field in schema.model_fields.items()
+        if field.is_required()
+    }
+
+
+def _classifier_payload(rng: random.Random, system: str, human: str) -> dict:
+    results = []
+    preferred = random.Random(human)
+    for axis_name, categories in _parse_axes(system).items():
+        if not categories:
+            continue
+        category = preferred.choice(categories)
+        if rng.random() < 0.25:
+            category = rng.choice(categories)
+        others = [c for c in categories if c != category]
+        results.append({
+            "axis_name": axis_name,
+            "category": category,
+            "confidence": round(rng.uniform(0.55, 0.98), 2),
+            "reasoning": "Classification simulee.",
+            "alternative": (
+                {"category": rng.choice(others), "confidence": round(rng.uniform(0.05, 0.4), 2)}
+                if others
+                else None
+            ),
+        })
+    return {"results": results}
+
+
+def _challenger_payload(rng: random.Random, system: str, human: str) -> dict:
+    axes = _parse_axes(system)
+    challenges = []
+    for weak in _parse_json_array(human):
+        axis_name = weak.get("axis_name", "")
+        category = weak.get("category", "")
+        agrees = rng.random() < 0.6
+        alternatives = [c for c in axes.get(axis_name, []) if c != category]
+        challenges.append({
+            "axis_name": axis_name,
+            "alternative_category": category if agrees or not alternatives else rng.choice(alternatives),
+            "argument": "Contre-argument simule.",
+            "agrees_with_original": agrees,
+        })
+    return {"challenges": challenges}
+
+
+def _reformulations_payload(rng: random.Random, system: str, human: str) -> dict:
+    return {
+        "reformulations": [
+            {"id": str(t["id"]), "reformulated_text": t.get("text", "")}
+            for t in _parse_json_array(human)
+            if "id" in t
+        ]
+    }
+
+
+def _judge_payload(rng: random.Random, system: str, human: str) -> dict:
+    results = _parse_json_array(human)
+    return {
+        "ticket_evaluations": [
+            {
+                "classification_id": str(r["classification_id"]),
+                "meaning_preserved": rng.random() < 0.9,
+                "confidence_analysis": "Analyse simulee.",
+            }
+            for r in results
+            if "classification_id" in r
+        ],
+        "rules_to_add": [f"Regle simulee {rng.randint(1, 20)}"] if rng.random() < 0.5 else [],
+        "rules_to_remove": [],
+        "rules_to_modify": [],
+        "global_diagnosis": f"Diagnostic simule sur {len(results)} tickets.",
+    }
+
+
+def _judge_reduce_payload(rng: random.Random, system: str, human: str) -> dict:
+    rules_to_add: list[str] = []
+    for proposal in _parse_json_array(human):
+        for rule in proposal.get("rules_to_add", []):
+            if rule not in rules_to_add:
+                rules_to_add.append(rule)
+    return {
+        "rules_to_add": rules_to_add,
+        "rules_to_remove": [],
+        "rules_to_modify": [],
+        "global_diagnosis": "Diagnostic consolide simule.",
+    }
+
+
+PAYLOAD_BUILDERS = {
+    "ClassifierOutput": _classifier_payload,
+    "ChallengerOutput": _challenger_payload,
+    "ReformulationsOutput": _reformulations_payload,
+    "JudgeOutput": _judge_payload,
+    "JudgeReduceOutput": _judge_reduce_payload,
+}
+
+
+class FakeChatModel(BaseChatModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model_name: str = "fake"
+    latency_ms: float = 0.0
+    latency_sigma: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+
+    _calls: Any = PrivateAttr(default_factory=count)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Any = None, **kwargs: Any):
+        tools = [convert_to_openai_tool(t) if isinstance(t, BaseTool) else t for t in tools]
+        return self.bind(tools=tools, tool_choice=tool_choice, **kwargs)
+
+    def _latency(self, rng: random.Random) -> float:
+        if self.latency_ms <= 0:
+            return 0.0
+        return rng.lognormvariate(0.0, self.latency_sigma) * self.latency_ms / 1000
+
+    def _respond(
+        self, messages: list[BaseMessage], **kwargs: Any
+    ) -> tuple[AIMessage | None, float]:
+        system = next((m.text for m in messages if m.type == "system"), "")
+        human = messages[-1].text if messages else ""
+        call_index = next(self._calls)
+        rng = random.Random(f"{self.seed}:{self.model_name}:{call_index}:{human}")
+        delay = self._latency(rng)
+
+        if rng.random() < self.error_rate:
+            return None, delay
+
+        tools = kwargs.get("tools") or []
+        schema = tools[0] if len(tools) == 1 else None
+        if (
+            kwargs.get("tool_choice")
+            and isinstance(schema, type)
+            and issubclass(schema, BaseModel)
+        ):
+            builder = PAYLOAD_BUILDERS.get(schema.__name__)
+            args = builder(rng, system, human) if builder else _minimal_payload(schema)
+            args = schema.model_validate(args).model_dump()
+            content = ""
+            output_text = json.dumps(args, ensure_ascii=False)
+            tool_calls = [{
+                "name": schema.__name__,
+                "args": args,
+                "id": f"call_fake_{call_index}",
+                "type": "tool_call",
+            }]
+        else:
+            content = "Reponse simulee."
+            output_text = content
+            tool_calls = []
+
+        input_tokens = sum(len(m.text) for m in messages) // 4
+        output_tokens = max(1, len(output_text) // 4)
+        message = AIMessage(
+            content=content,
+            tool_calls=tool_calls,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+            response_metadata={"model_name": self.model_name},
+        )
+        return message, delay
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message, delay = self._respond(messages, **kwargs)
+        time.sleep(delay)
+        if message is None:
+            raise FakeLLMError("Erreur simulee du backend LLM")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message, delay = self._respond(messages, **kwargs)
+        await asyncio.sleep(delay)
+        if message is None:
+            raise FakeLLMError("Erreur simulee du backend LLM")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class FakeEmbeddings(Embeddings):
+    def __init__(self, latency_ms: float = 0.0, dimensions: int = EMBEDDING_DIMENSIONS):
+        self.latency_ms = latency_ms
+        self.dimensions = dimensions
+
+    def _vector(self, text: str) -> list[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dimensions)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        time.sleep(self.latency_ms / 1000)
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        time.sleep(self.latency_ms / 1000)
+        return self._vector(text)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        await asyncio.sleep(self.latency_ms / 1000)
+        return [self._vector(t) for t in texts]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        await asyncio.sleep(self.latency_ms / 1000)
+        return self._vector(text)
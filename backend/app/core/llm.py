@@ -1,30 +1,72 @@
+import httpx
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 
 from app.core.config import settings
+from app.core.metrics import LLMCallMetrics
 
-classifier_llm = ChatOpenAI(
-    model=settings.classifier_model,
+
+_llm_http_client = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_connections=settings.llm_max_concurrency,
+        max_keepalive_connections=settings.llm_max_concurrency,
+    ),
+    timeout=httpx.Timeout(600.0, connect=5.0),
+)
+
+
+def _chat_model(model: str, **kwargs):
+    callbacks = [LLMCallMetrics(model)]
+    if settings.llm_backend == "fake":
+        from app.core.fake_llm import FakeChatModel
+
+        return FakeChatModel(
+            model_name=model,
+            latency_ms=settings.fake_llm_latency_ms,
+            latency_sigma=settings.fake_llm_latency_sigma,
+            error_rate=settings.fake_llm_error_rate,
+            seed=settings.fake_llm_seed,
+            callbacks=callbacks,
+        )
+    return ChatOpenAI(
+        model=model,
+        callbacks=callbacks,
+        max_retries=settings.llm_max_retries,
+        http_async_client=_llm_http_client,
+        **kwargs,
+    )
+
+
+def _embeddings_model():
+    if settings.llm_backend == "fake":
+        from app.core.fake_llm import FakeEmbeddings
+
+        return FakeEmbeddings(latency_ms=settings.fake_embedding_latency_ms)
+    return OpenAIEmbeddings(model=settings.embedding_model)
+
+
+classifier_llm = _chat_model(
+    settings.classifier_model,
     model_kwargs={"reasoning_effort": "low"},
 )
 
-challenger_llm = ChatOpenAI(
-    model=settings.challenger_model,
+challenger_llm = _chat_model(
+    settings.challenger_model,
     model_kwargs={"reasoning_effort": "medium"},
 )
 
-agent_llm = ChatOpenAI(
-    model=settings.agent_model,
+agent_llm = _chat_model(
+    settings.agent_model,
     model_kwargs={"reasoning_effort": "medium"},
 )
 
-evaluator_llm = ChatOpenAI(
-    model=settings.evaluator_model,
+evaluator_llm = _chat_model(
+    settings.evaluator_model,
     model_kwargs={"reasoning_effort": "low"},
 )
 
-generator_llm = ChatOpenAI(
-    model=settings.generator_model,
+generator_llm = _chat_model(
+    settings.generator_model,
     temperature=0.7,
 )
 
-embeddings = OpenAIEmbeddings(model=settings.embedding_model)
+embeddings = _embeddings_model()
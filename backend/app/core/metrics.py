@@ -0,0 +1,202 @@
+import asyncio
+import time
+from collections import Counter
+from contextvars import ContextVar
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from prometheus_client import REGISTRY, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000)
+
+CLASSIFICATION_STAGE_SECONDS = Histogram(
+    "alloclass_classification_stage_seconds",
+    "Duree de chaque etape du pipeline de classification",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+
+CLASSIFICATION_TOKENS = Histogram(
+    "alloclass_classification_tokens",
+    "Tokens consommes par classification",
+    ["kind"],
+    buckets=TOKEN_BUCKETS,
+)
+
+
+def token_usage(message) -> dict[str, int]:
+    usage = getattr(message, "usage_metadata", None) or {}
+    return {
+        "prompt": usage.get("input_tokens", 0),
+        "completion": usage.get("output_tokens", 0),
+    }
+
+
+def observe_classification(metrics: dict) -> None:
+    for stage, value in metrics["stages_ms"].items():
+        for elapsed_ms in value if isinstance(value, list) else [value]:
+            CLASSIFICATION_STAGE_SECONDS.labels(stage=stage).observe(elapsed_ms / 1000)
+    for kind, count in metrics["tokens"].items():
+        CLASSIFICATION_TOKENS.labels(kind=kind).observe(count)
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "alloclass_http_request_seconds",
+    "Duree des requetes HTTP par route",
+    ["method", "route", "status"],
+    buckets=STAGE_BUCKETS,
+)
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "alloclass_db_queries_per_request",
+    "Requetes SQL executees par requete HTTP",
+    ["route"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250),
+)
+
+DB_POOL_WAIT_SECONDS = Histogram(
+    "alloclass_db_pool_wait_seconds",
+    "Attente pour obtenir une connexion du pool SQLAlchemy",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+EVENT_LOOP_LAG_SECONDS = Gauge(
+    "alloclass_event_loop_lag_seconds",
+    "Dernier retard mesure de la boucle asyncio",
+)
+
+LLM_IN_FLIGHT = Gauge(
+    "alloclass_llm_in_flight",
+    "Appels LLM en cours par modele",
+    ["model"],
+)
+
+LLM_CALL_SECONDS = Histogram(
+    "alloclass_llm_call_seconds",
+    "Duree des appels LLM par modele",
+    ["model", "outcome"],
+    buckets=STAGE_BUCKETS,
+)
+
+_request_queries: ContextVar[list[int] | None] = ContextVar("request_queries", default=None)
+
+
+def count_query(*args, **kwargs) -> None:
+    counter = _request_queries.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        counter = [0]
+        token = _request_queries.set(counter)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_queries.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            HTTP_REQUEST_SECONDS.labels(
+                method=scope["method"], route=route_path, status=str(status["code"])
+            ).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(route=route_path).observe(counter[0])
+
+
+class LLMCallMetrics(AsyncCallbackHandler):
+    def __init__(self, model: str):
+        self.model = model
+        self._started: dict[UUID, float] = {}
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs) -> None:
+        self._started[run_id] = time.perf_counter()
+        LLM_IN_FLIGHT.labels(model=self.model).inc()
+
+    async def _finish(self, run_id: UUID, outcome: str) -> None:
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        LLM_IN_FLIGHT.labels(model=self.model).dec()
+        LLM_CALL_SECONDS.labels(model=self.model, outcome=outcome).observe(
+            time.perf_counter() - started
+        )
+
+    async def on_llm_end(self, response, *, run_id: UUID, **kwargs) -> None:
+        await self._finish(run_id, "success")
+
+    async def on_llm_error(self, error, *, run_id: UUID, **kwargs) -> None:
+        await self._finish(run_id, "error")
+
+
+class RuntimeCollector(Collector):
+    def describe(self):
+        return []
+
+    def collect(self):
+        from app.core.database import engine
+        from app.services.iterative_ground_truth.jobs import ground_truth_job_manager
+        from app.services.ticket_generation.blind_ticket_generator import drip_feed_manager
+
+        pool = engine.pool
+        pool_gauge = GaugeMetricFamily(
+            "alloclass_db_pool_connections",
+            "Etat du pool de connexions SQLAlchemy",
+            labels=["state"],
+        )
+        pool_gauge.add_metric(["size"], pool.size())
+        pool_gauge.add_metric(["checked_out"], pool.checkedout())
+        pool_gauge.add_metric(["checked_in"], pool.checkedin())
+        pool_gauge.add_metric(["overflow"], max(pool.overflow(), 0))
+        yield pool_gauge
+
+        drip_status = drip_feed_manager.get_status()
+        yield GaugeMetricFamily(
+            "alloclass_drip_feed_running",
+            "Drip feed en cours (1) ou arrete (0)",
+            value=int(drip_status["is_running"]),
+        )
+        yield GaugeMetricFamily(
+            "alloclass_drip_feed_generated",
+            "Tickets generes par le drip feed courant",
+            value=drip_status["generated_count"],
+        )
+
+        jobs_gauge = GaugeMetricFamily(
+            "alloclass_ground_truth_jobs",
+            "Runs ground truth connus par statut",
+            labels=["status"],
+        )
+        counts = Counter(job.status for job in ground_truth_job_manager.jobs.values())
+        for status in ("queued", "running", "done", "failed", "cancelled"):
+            jobs_gauge.add_metric([status], counts.get(status, 0))
+        yield jobs_gauge
+
+
+REGISTRY.register(RuntimeCollector())
+
+
+async def monitor_event_loop_lag(interval: float) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG_SECONDS.set(max(loop.time() - expected, 0.0))
@@ -0,0 +1,23 @@
+from pgvector import Vector
+from pgvector.sqlalchemy import VECTOR
+from sqlalchemy import bindparam
+
+EMBEDDING_DIMENSIONS = 1536
+
+
+class BinaryVector(VECTOR):
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        def process(value):
+            if value is None:
+                return None
+            vector = value if isinstance(value, Vector) else Vector(value)
+            if self.dim is not None and vector.dimensions() != self.dim:
+                raise ValueError(f"expected {self.dim} dimensions, not {vector.dimensions()}")
+            return vector
+        return process
+
+
+def vector_param(name: str, dim: int = EMBEDDING_DIMENSIONS):
+    return bindparam(name, type_=BinaryVector(dim))
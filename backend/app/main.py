@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -15,18 +16,35 @@ from app.api import (
     feedbacks,
     imports,
     learned_rules,
+    metrics,
+    review_queue,
 )
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, monitor_event_loop_lag
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    from app.core.compute import shutdown_executor
     from app.core.database import async_session
     from app.services.config.config_management import ensure_default_config
+    from app.services.iterative_ground_truth.checkpointer import (
+        close_checkpointer,
+        open_checkpointer,
+    )
+    from app.services.iterative_ground_truth.jobs import ground_truth_job_manager
 
     async with async_session() as db:
         await ensure_default_config(db)
+    await open_checkpointer()
+    loop_lag_task = asyncio.create_task(
+        monitor_event_loop_lag(settings.event_loop_lag_interval)
+    )
     yield
+    loop_lag_task.cancel()
+    await ground_truth_job_manager.shutdown()
+    await close_checkpointer()
+    shutdown_executor()
 
 
 app = FastAPI(
@@ -36,6 +54,7 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
@@ -55,3 +74,5 @@ app.include_router(analytics.router)
 app.include_router(evaluate.router)
 app.include_router(imports.router)
 app.include_router(learned_rules.router)
+app.include_router(review_queue.router)
+app.include_router(metrics.router)
@@ -9,6 +9,7 @@ from app.models.learned_rule import LearnedRule
 from app.models.prompt_version import PromptVersion
 from app.models.conversation import Conversation
 from app.models.chat_message import ChatMessage
+from app.models.review_queue_item import ReviewQueueItem
 
 __all__ = [
     "Base",
@@ -22,4 +23,5 @@ __all__ = [
     "PromptVersion",
     "Conversation",
     "ChatMessage",
+    "ReviewQueueItem",
 ]
@@ -1,9 +1,9 @@
 import uuid
 from datetime import datetime
 
-from pgvector.sqlalchemy import Vector
 from sqlalchemy import (
     Boolean,
+    Computed,
     DateTime,
     Float,
     ForeignKey,
@@ -14,9 +14,10 @@ from sqlalchemy import (
     func,
     text,
 )
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.vector import EMBEDDING_DIMENSIONS, BinaryVector
 from app.models.base import Base
 
 
@@ -25,6 +26,19 @@ class ClassificationResult(Base):
     __table_args__ = (
         Index("ix_classif_config_created", "config_id", "created_at"),
         Index("ix_classif_confidence", "overall_confidence"),
+        Index("ix_classif_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_classif_results_path_ops",
+            "results",
+            postgresql_using="gin",
+            postgresql_ops={"results": "jsonb_path_ops"},
+        ),
+        Index(
+            "ix_classif_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -40,7 +54,13 @@ class ClassificationResult(Base):
     tokens_used: Mapped[int] = mapped_column(Integer, default=0)
     processing_time_ms: Mapped[int] = mapped_column(Integer, default=0)
     vote_details: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
-    embedding = mapped_column(Vector(1536), nullable=True)
+    metrics: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    embedding = mapped_column(BinaryVector(EMBEDDING_DIMENSIONS), nullable=True)
+    search_vector = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('french', coalesce(input_text, ''))", persisted=True),
+        deferred=True,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -0,0 +1,33 @@
+import uuid
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, String, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base
+
+if TYPE_CHECKING:
+    from app.models.classification_result import ClassificationResult
+
+
+class ReviewQueueItem(Base):
+    __tablename__ = "review_queue_items"
+    __table_args__ = (
+        Index("ix_review_queue_config_priority", "config_id", "priority_score"),
+    )
+
+    classification_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("classification_results.id", ondelete="CASCADE"), primary_key=True
+    )
+    config_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("configs.id", ondelete="CASCADE"))
+    priority_score: Mapped[float] = mapped_column(Float)
+    claimed_by: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    classification_result: Mapped["ClassificationResult"] = relationship()
@@ -0,0 +1,16 @@
+CONVERSATION_SUMMARY_SYSTEM = """Tu resumes une conversation entre un utilisateur et le copilote d'AlloClass, un systeme de classification de tickets.
+
+Le resume remplace les anciens messages dans le contexte du copilote. Conserve :
+- les tickets classifies et les categories retenues
+- les corrections demandees par l'utilisateur et les regles evoquees
+- les questions encore ouvertes et les preferences exprimees
+
+Ecris en francais, a la troisieme personne, en 10 phrases maximum. Ne recopie pas les tableaux ni les resultats bruts des outils."""
+
+CONVERSATION_SUMMARY_USER = """RESUME PRECEDENT :
+{previous_summary}
+
+NOUVEAUX MESSAGES A INTEGRER :
+{messages}
+
+Produis le resume mis a jour."""
@@ -80,3 +80,38 @@ Tickets au-dessus du seuil ({target_confidence:.0%}) : {above_threshold}/{total_
 {results_json}
 
 Evalue ces resultats et propose des ajustements aux regles du generateur."""
+
+JUDGE_REDUCE_SYSTEM = """Tu consolides les propositions de plusieurs juges.
+Chaque juge a evalue une partie des tickets d'un meme round.
+
+## Axes et categories :
+{axes_and_categories}
+
+## Regles actuelles du generateur :
+{current_rules}
+
+## Ton travail :
+1. Fusionne les regles proposees : elimine les doublons et les variantes d'une meme idee.
+2. Si des juges proposent des operations contradictoires sur une meme regle, garde la mieux justifiee par leurs diagnostics.
+3. Redige un diagnostic global du round a partir des diagnostics partiels.
+
+IMPORTANT : reference les regles existantes par leur index numerique.
+
+## FORMAT DE SORTIE (JSON strict) :
+{{
+    "rules_to_add": ["..."],
+    "rules_to_remove": [0],
+    "rules_to_modify": [
+        {{
+            "index": 0,
+            "new_rule": "..."
+        }}
+    ],
+    "global_diagnosis": "..."
+}}"""
+
+JUDGE_REDUCE_USER = """## Round {round_number} : propositions de {shard_count} juges
+
+{proposals_json}
+
+Produis la liste consolidee des operations sur les regles."""
@@ -36,16 +36,3 @@ REQUETE DE L'UTILISATEUR :
 \"\"\"{message}\"\"\"
 
 FILTRE JSON :"""
-
-TICKET_QUERY_SEMANTIC_PROMPT = """La requete de l'utilisateur ne correspond pas a un filtre structure.
-Elle semble demander une recherche semantique (par similarite de contenu).
-
-Extrais le CONCEPT cle a rechercher par similarite vectorielle.
-
-REQUETE : \"\"\"{message}\"\"\"
-
-Retourne un JSON strict :
-{{
-    "search_text": "le concept a chercher par embedding",
-    "limit": 20
-}}"""
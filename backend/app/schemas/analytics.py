@@ -1,3 +1,4 @@
+from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -29,6 +30,7 @@ class AxisStatsResponse(BaseModel):
 
 
 class EmbeddingPoint(BaseModel):
+    id: str
     x: float
     y: float
     label: str
@@ -40,6 +42,35 @@ class EmbeddingMapResponse(BaseModel):
     points: list[EmbeddingPoint]
 
 
+class EmbeddingBounds(BaseModel):
+    x_min: float
+    x_max: float
+    y_min: float
+    y_max: float
+
+
+class EmbeddingBin(BaseModel):
+    x: float
+    y: float
+    width: float
+    height: float
+    count: int
+    avg_confidence: float = Field(ge=0, le=1)
+    dominant_category: str
+    category_counts: dict[str, int]
+
+
+class EmbeddingTileResponse(BaseModel):
+    mode: Literal["points", "sample", "bins"]
+    zoom: int
+    total: int
+    visible: int
+    bounds: EmbeddingBounds | None
+    viewport: EmbeddingBounds | None
+    points: list[EmbeddingPoint]
+    bins: list[EmbeddingBin]
+
+
 class MatrixAxis(BaseModel):
     name: str
     categories: list[str]
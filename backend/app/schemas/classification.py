@@ -44,6 +44,7 @@ class ClassificationResponse(BaseModel):
     model_used: str
     tokens_used: int
     processing_time_ms: int
+    metrics: dict | None = None
     created_at: datetime
 
     model_config = {"from_attributes": True}
@@ -54,3 +55,18 @@ class ClassificationListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+
+
+class ClassificationSearchHit(BaseModel):
+    id: UUID
+    headline: str
+    rank: float
+    results: list[AxisResultDetail]
+    overall_confidence: float = Field(ge=0, le=1)
+    created_at: datetime
+
+
+class ClassificationSearchResponse(BaseModel):
+    query: str
+    total: int
+    items: list[ClassificationSearchHit]
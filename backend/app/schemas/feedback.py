@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Literal
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class FeedbackCreate(BaseModel):
@@ -33,3 +33,25 @@ class SuggestionResponse(BaseModel):
     message: str
     axis_id: UUID | None = None
     details: dict | None = None
+
+
+class ReviewQueueItemResponse(BaseModel):
+    classification_id: UUID
+    text_preview: str
+    priority_score: float
+    reason: str
+    current_classification: list[dict] | None = None
+    challenger_opinion: list[dict] | None = None
+    claimed_by: str | None = None
+    lease_expires_at: datetime | None = None
+
+
+class ReviewClaimRequest(BaseModel):
+    config_id: UUID
+    reviewer: str = Field(min_length=1, max_length=100)
+    count: int = Field(default=1, gt=0, le=50)
+    lease_seconds: int | None = Field(default=None, gt=0, le=86400)
+
+
+class ReviewReleaseRequest(BaseModel):
+    reviewer: str = Field(min_length=1, max_length=100)
@@ -57,11 +57,6 @@ class TicketQueryOutput(BaseModel):
     aggregation: str | None = None
 
 
-class SemanticQueryOutput(BaseModel):
-    search_text: str
-    limit: int = 20
-
-
 class TicketEvaluation(BaseModel):
     classification_id: str
     meaning_preserved: bool
@@ -81,6 +76,13 @@ class JudgeOutput(BaseModel):
     global_diagnosis: str
 
 
+class JudgeReduceOutput(BaseModel):
+    rules_to_add: list[str]
+    rules_to_remove: list[int]
+    rules_to_modify: list[RuleModification]
+    global_diagnosis: str
+
+
 class Reformulation(BaseModel):
     id: str
     reformulated_text: str
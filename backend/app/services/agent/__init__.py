@@ -1,3 +1,3 @@
-from .agent import run_agent
+from .agent import invalidate_compiled_agent, run_agent
 
-__all__ = ["run_agent"]
+__all__ = ["invalidate_compiled_agent", "run_agent"]
@@ -1,16 +1,21 @@
 import json
 import uuid
 from collections.abc import AsyncGenerator
+from datetime import datetime, timezone
+from uuid import UUID
 
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage
+from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import create_react_agent
-from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import async_session
 from app.core.llm import agent_llm
 from app.models.chat_message import ChatMessage
 from app.models.config import Config
+from app.models.conversation import Conversation
 
-from .history import load_conversation_history
+from .history import estimate_tokens, load_conversation_history, schedule_summary_refresh
+from .intent_router import route_intent
 from .system_prompt import build_system_prompt
 from .tools_def import create_agent_tools
 
@@ -69,42 +74,117 @@ def summarize_tool_result(tool_name: str, result: dict) -> str:
         case _:
             return "Termine"
 
+
+def render_tool_result(tool_name: str, result: dict) -> str:
+    summary = summarize_tool_result(tool_name, result)
+    if "error" in result:
+        return summary
+
+    match tool_name:
+        case "get_review_queue" if result.get("tickets"):
+            ticket = result["tickets"][0]
+            categories = ", ".join(
+                f"{r.get('axis_name', '?')} : {r.get('category_name', '?')}"
+                for r in ticket.get("current_classification") or []
+            )
+            return (
+                f"{summary}. Prochain ticket ({ticket.get('reason', '')}) :\n\n"
+                f"> {ticket.get('text_preview', '')}\n\n"
+                f"Classification actuelle : {categories or 'aucune'}"
+            )
+        case "get_stats":
+            return (
+                f"{summary}, taux de challenge {round(result.get('challenge_rate', 0) * 100)}%, "
+                f"{result.get('feedback_count', 0)} feedback(s)."
+            )
+        case _:
+            return summary
+
 MAX_TOOL_ITERATIONS = 5
 
+_agent_tools = create_agent_tools()
+_agent_tools_by_name = {t.name: t for t in _agent_tools}
+_compiled_agents: dict[UUID, tuple[datetime, CompiledStateGraph]] = {}
 
-async def run_agent(
-    user_message: str,
-    config: Config,
-    db: AsyncSession,
-    conversation_id: "uuid.UUID | None" = None,
-) -> AsyncGenerator[dict, None]:
-    user_msg = ChatMessage(
-        config_id=config.id,
-        conversation_id=conversation_id,
-        role="user",
-        content=user_message,
-    )
-    db.add(user_msg)
-    await db.flush()
 
-    system_prompt = build_system_prompt(config)
-    history = await load_conversation_history(
-        config.id, db, limit=20, conversation_id=conversation_id
-    )
+def get_compiled_agent(config: Config) -> CompiledStateGraph:
+    cached = _compiled_agents.get(config.id)
+    if cached is not None and cached[0] == config.updated_at:
+        return cached[1]
 
-    tools = create_agent_tools(config, db)
     react_agent = create_react_agent(
-        model=agent_llm,
-        tools=tools,
-        prompt=system_prompt,
+        model=agent_llm.bind_tools(_agent_tools, parallel_tool_calls=True),
+        tools=_agent_tools,
+        prompt=build_system_prompt(config),
     )
+    _compiled_agents[config.id] = (config.updated_at, react_agent)
+    return react_agent
+
 
+def invalidate_compiled_agent(config_id: UUID) -> None:
+    _compiled_agents.pop(config_id, None)
+
+
+async def _fast_path_events(tool_name: str, tool_args: dict, run_config: dict):
+    yield {"event": "on_tool_start", "name": tool_name}
+    result = await _agent_tools_by_name[tool_name].ainvoke(tool_args, config=run_config)
+    yield {"event": "on_tool_end", "name": tool_name, "data": {"output": result}}
+    yield {
+        "event": "on_chat_model_stream",
+        "data": {"chunk": AIMessageChunk(content=render_tool_result(tool_name, result))},
+    }
+
+
+def _agent_messages(history: dict) -> list:
     messages = []
-    for msg in history:
+    if history["summary"]:
+        messages.append(SystemMessage(
+            content=f"Resume des echanges precedents :\n{history['summary']}"
+        ))
+    for msg in history["messages"]:
         if msg["role"] == "user":
             messages.append(HumanMessage(content=msg["content"]))
         else:
             messages.append(AIMessage(content=msg["content"]))
+    return messages
+
+
+async def run_agent(
+    user_message: str,
+    config: Config,
+    conversation_id: "uuid.UUID | None" = None,
+) -> AsyncGenerator[dict, None]:
+    intent = route_intent(user_message)
+    async with async_session() as db:
+        db.add(ChatMessage(
+            config_id=config.id,
+            conversation_id=conversation_id,
+            role="user",
+            content=user_message,
+            intent=intent[0] if intent else None,
+            token_count=estimate_tokens(user_message),
+        ))
+        await db.flush()
+        history = (
+            await load_conversation_history(conversation_id, db)
+            if conversation_id and intent is None
+            else {"summary": None, "messages": [{"role": "user", "content": user_message}]}
+        )
+        await db.commit()
+
+    run_config = {
+        "recursion_limit": MAX_TOOL_ITERATIONS * 2 + 1,
+        "configurable": {
+            "classification_config": config,
+            "conversation_id": str(conversation_id) if conversation_id else None,
+        },
+    }
+    if intent is not None:
+        events = _fast_path_events(*intent, run_config)
+    else:
+        events = get_compiled_agent(config).astream_events(
+            {"messages": _agent_messages(history)}, version="v2", config=run_config
+        )
 
     final_text = ""
     tool_results_for_frontend: list[dict] = []
@@ -113,11 +193,7 @@ async def run_agent(
     tool_depth = 0
 
     try:
-        async for event in react_agent.astream_events(
-            {"messages": messages},
-            version="v2",
-            config={"recursion_limit": MAX_TOOL_ITERATIONS * 2 + 1},
-        ):
+        async for event in events:
             kind = event["event"]
 
             if kind == "on_chat_model_stream":
@@ -210,24 +286,24 @@ async def run_agent(
             if learning_card_data:
                 metadata["learning_card"] = learning_card_data
 
-        assistant_msg = ChatMessage(
-            config_id=config.id,
-            conversation_id=conversation_id,
-            role="assistant",
-            content=final_text,
-            metadata_=metadata,
-        )
-        db.add(assistant_msg)
+        async with async_session() as db:
+            db.add(ChatMessage(
+                config_id=config.id,
+                conversation_id=conversation_id,
+                role="assistant",
+                content=final_text,
+                token_count=estimate_tokens(final_text),
+                metadata_=metadata,
+            ))
+
+            if conversation_id:
+                conv = await db.get(Conversation, conversation_id)
+                if conv:
+                    conv.updated_at = datetime.now(timezone.utc)
+                    if not conv.title:
+                        conv.title = user_message[:80]
+
+            await db.commit()
 
         if conversation_id:
-            from datetime import datetime, timezone
-
-            from app.models.conversation import Conversation
-
-            conv = await db.get(Conversation, conversation_id)
-            if conv:
-                conv.updated_at = datetime.now(timezone.utc)
-                if not conv.title:
-                    conv.title = user_message[:80]
-
-        await db.commit()
+            schedule_summary_refresh(conversation_id)
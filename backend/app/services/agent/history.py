@@ -1,28 +1,130 @@
+import asyncio
+import logging
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import select
+from langchain_core.messages import HumanMessage, SystemMessage
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.database import async_session
+from app.core.llm import classifier_llm
 from app.models.chat_message import ChatMessage
+from app.models.conversation import Conversation
+from app.prompts.chat_history import CONVERSATION_SUMMARY_SYSTEM, CONVERSATION_SUMMARY_USER
+
+SUMMARY_MESSAGE_CHARS = 2000
+
+logger = logging.getLogger(__name__)
+
+_summary_refreshes: dict[UUID, asyncio.Task] = {}
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _recent_window(conversation_id: UUID, summarized_until: datetime | None, token_budget: int):
+    newest_first = ChatMessage.created_at.desc()
+    running_tokens = func.sum(ChatMessage.token_count).over(order_by=newest_first)
+    position = func.row_number().over(order_by=newest_first)
+
+    query = select(
+        ChatMessage.id,
+        or_(running_tokens <= token_budget, position == 1).label("within_budget"),
+    ).where(ChatMessage.conversation_id == conversation_id)
+    if summarized_until is not None:
+        query = query.where(ChatMessage.created_at > summarized_until)
+    return query.subquery()
 
 
 async def load_conversation_history(
-    config_id: UUID,
+    conversation_id: UUID,
     db: AsyncSession,
-    limit: int = 20,
-    conversation_id: UUID | None = None,
-) -> list[dict]:
-    query = select(ChatMessage)
-
-    if conversation_id:
-        query = query.where(ChatMessage.conversation_id == conversation_id)
-    else:
-        query = query.where(ChatMessage.config_id == config_id)
+    token_budget: int | None = None,
+) -> dict:
+    conversation = await db.get(Conversation, conversation_id)
+    if conversation is None:
+        return {"summary": None, "messages": []}
 
+    window = _recent_window(
+        conversation_id,
+        conversation.summarized_until,
+        token_budget or settings.chat_history_token_budget,
+    )
     result = await db.execute(
-        query.order_by(ChatMessage.created_at.desc()).limit(limit)
+        select(ChatMessage.role, ChatMessage.content)
+        .join(window, window.c.id == ChatMessage.id)
+        .where(window.c.within_budget)
+        .order_by(ChatMessage.created_at)
     )
-    rows = list(result.scalars().all())
-    rows.reverse()
+    return {
+        "summary": conversation.summary,
+        "messages": [{"role": role, "content": content} for role, content in result.all()],
+    }
+
+
+async def refresh_conversation_summary(conversation_id: UUID) -> None:
+    async with async_session() as db:
+        conversation = await db.get(Conversation, conversation_id)
+        if conversation is None:
+            return
+        previous_summary = conversation.summary
+        window = _recent_window(
+            conversation_id,
+            conversation.summarized_until,
+            settings.chat_history_token_budget,
+        )
+        result = await db.execute(
+            select(
+                ChatMessage.role,
+                ChatMessage.content,
+                ChatMessage.token_count,
+                ChatMessage.created_at,
+            )
+            .join(window, window.c.id == ChatMessage.id)
+            .where(~window.c.within_budget)
+            .order_by(ChatMessage.created_at)
+        )
+        overflow = result.all()
+
+    if sum(row.token_count for row in overflow) < settings.chat_summary_trigger_tokens:
+        return
+
+    messages_text = "\n".join(
+        f"{'Utilisateur' if row.role == 'user' else 'Copilote'} : {row.content[:SUMMARY_MESSAGE_CHARS]}"
+        for row in overflow
+    )
+    response = await classifier_llm.ainvoke([
+        SystemMessage(content=CONVERSATION_SUMMARY_SYSTEM),
+        HumanMessage(content=CONVERSATION_SUMMARY_USER.format(
+            previous_summary=previous_summary or "Aucun resume pour le moment.",
+            messages=messages_text,
+        )),
+    ])
+
+    async with async_session() as db:
+        conversation = await db.get(Conversation, conversation_id)
+        if conversation is None:
+            return
+        conversation.summary = response.text
+        conversation.summarized_until = overflow[-1].created_at
+        await db.commit()
+
+
+def schedule_summary_refresh(conversation_id: UUID) -> None:
+    if conversation_id in _summary_refreshes:
+        return
+    _summary_refreshes[conversation_id] = asyncio.create_task(
+        _refresh_summary_task(conversation_id)
+    )
+
 
-    return [{"role": row.role, "content": row.content} for row in rows]
+async def _refresh_summary_task(conversation_id: UUID) -> None:
+    try:
+        await refresh_conversation_summary(conversation_id)
+    except Exception:
+        logger.exception("Echec du resume de la conversation %s", conversation_id)
+    finally:
+        _summary_refreshes.pop(conversation_id, None)
@@ -0,0 +1,36 @@
+import re
+
+CLASSIFY_COMMAND = re.compile(
+    r"^\s*(?:classifie[rz]?|classe[rz]?|ticket)"
+    r"(?:\s+(?:ce|le|mon|un)\s+ticket)?\s*:\s*(?P<text>\S.*)$",
+    re.IGNORECASE | re.DOTALL,
+)
+QUOTED_TICKET = re.compile(r'^\s*(?:"(?P<a>[^"]+)"|«\s*(?P<b>[^»]+?)\s*»)\s*$', re.DOTALL)
+NEXT_TICKET = re.compile(
+    r"^\s*(?:(?:montre|donne|affiche)(?:[- ]moi)?\s+)?(?:le\s+)?"
+    r"(?:ticket\s+suivant|prochain\s+ticket(?:\s+[aà]\s+revoir)?|suivant)\s*[.!]*\s*$",
+    re.IGNORECASE,
+)
+STATS = re.compile(
+    r"^\s*(?:(?:montre|donne|affiche)(?:[- ]moi)?\s+)?(?:les\s+)?"
+    r"(?:stats|statistiques|kpis?)\s*[.!]*\s*$",
+    re.IGNORECASE,
+)
+
+MIN_TICKET_LENGTH = 10
+
+
+def route_intent(message: str) -> tuple[str, dict] | None:
+    if match := CLASSIFY_COMMAND.match(message):
+        text = match.group("text").strip()
+        if len(text) >= MIN_TICKET_LENGTH:
+            return "classify_ticket", {"text": text}
+    if match := QUOTED_TICKET.match(message):
+        text = (match.group("a") or match.group("b")).strip()
+        if len(text) >= MIN_TICKET_LENGTH:
+            return "classify_ticket", {"text": text}
+    if NEXT_TICKET.match(message):
+        return "get_review_queue", {"count": 1}
+    if STATS.match(message):
+        return "get_stats", {}
+    return None
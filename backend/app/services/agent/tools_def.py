@@ -1,34 +1,101 @@
+import asyncio
+import json
+import time
 from functools import wraps
+from uuid import UUID
 
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.database import async_session
 from app.models.config import Config
 
 
-def create_agent_tools(config: Config, db: AsyncSession) -> list:
+class ToolResultCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: dict[tuple, tuple[float, asyncio.Future]] = {}
 
-    def with_rollback(func):
+    async def get_or_compute(self, key: tuple, compute):
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            return await asyncio.shield(entry[1])
+
+        future = asyncio.ensure_future(compute())
+        self._entries[key] = (now + self.ttl, future)
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            if self._entries.get(key, (None, None))[1] is future:
+                del self._entries[key]
+            raise
+
+    def invalidate(self, config_id: UUID) -> None:
+        for key in [k for k in self._entries if k[0] == config_id]:
+            del self._entries[key]
+
+
+tool_result_cache = ToolResultCache(ttl=settings.agent_tool_cache_ttl)
+
+
+def _active_config(runnable_config: RunnableConfig) -> Config:
+    return runnable_config["configurable"]["classification_config"]
+
+
+def _reviewer(runnable_config: RunnableConfig) -> str:
+    conversation_id = runnable_config["configurable"].get("conversation_id")
+    return f"chat:{conversation_id}" if conversation_id else "chat"
+
+
+def create_agent_tools() -> list:
+
+    def catch_errors(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
             try:
                 return await func(*args, **kwargs)
             except Exception as exc:
-                await db.rollback()
                 return {"error": str(exc)}
         return wrapper
 
+    def cached_read(func):
+        @wraps(func)
+        async def wrapper(*args, runnable_config: RunnableConfig, **kwargs):
+            key = (
+                _active_config(runnable_config).id,
+                func.__name__,
+                json.dumps([args, kwargs], sort_keys=True, default=str),
+            )
+            return await tool_result_cache.get_or_compute(
+                key, lambda: func(*args, runnable_config=runnable_config, **kwargs)
+            )
+        return wrapper
+
+    def invalidates_reads(func):
+        @wraps(func)
+        async def wrapper(*args, runnable_config: RunnableConfig, **kwargs):
+            try:
+                return await func(*args, runnable_config=runnable_config, **kwargs)
+            finally:
+                tool_result_cache.invalidate(_active_config(runnable_config).id)
+        return wrapper
+
     @tool
-    @with_rollback
-    async def classify_ticket(text: str) -> dict:
+    @catch_errors
+    @invalidates_reads
+    async def classify_ticket(text: str, runnable_config: RunnableConfig) -> dict:
         """Classifie un ticket texte sur tous les axes de la config active.
         Utilise cet outil quand l'utilisateur colle un texte a classifier
         ou demande explicitement une classification."""
         from app.services.classification.classification_pipeline import (
             classify_ticket as do_classify,
         )
-        classification = await do_classify(text, config, db)
+        config = _active_config(runnable_config)
+        async with async_session() as db:
+            classification = await do_classify(text, config, db)
         return {
             "classification_id": str(classification.id),
             "input_text": text[:100],
@@ -40,69 +107,83 @@ def create_agent_tools(config: Config, db: AsyncSession) -> list:
         }
 
     @tool
-    @with_rollback
-    async def search_tickets(query: str) -> dict:
+    @catch_errors
+    async def search_tickets(query: str, runnable_config: RunnableConfig) -> dict:
         """Recherche des tickets classifies par criteres (categorie, confiance, texte libre).
         Utilise cet outil quand l'utilisateur demande de chercher, lister,
         filtrer ou compter des tickets."""
-        from app.services.analytics.ticket_query import (
-            query_tickets_natural_language,
-            query_tickets_semantic,
-        )
-        result = await query_tickets_natural_language(query, config.id, db)
-        if result.get("total_count", 0) == 0 and not result.get("results"):
-            result = await query_tickets_semantic(query, config.id, db)
-        return result
+        from app.services.analytics.ticket_query import search_tickets_hybrid
+        config = _active_config(runnable_config)
+        return await search_tickets_hybrid(query, config.id)
 
     @tool
-    @with_rollback
-    async def correct_classification(feedback_message: str) -> dict:
+    @catch_errors
+    @invalidates_reads
+    async def correct_classification(
+        feedback_message: str, runnable_config: RunnableConfig
+    ) -> dict:
         """Corrige une classification en enregistrant un feedback.
         Utilise cet outil quand l'utilisateur dit 'non c'est X',
         'plutot Y', 'corrige vers Z', ou conteste un resultat."""
         from app.services.learning.feedback_learning import process_natural_feedback
-        return await process_natural_feedback(feedback_message, config.id, db)
+        config = _active_config(runnable_config)
+        async with async_session() as db:
+            return await process_natural_feedback(feedback_message, config.id, db)
 
     @tool
-    @with_rollback
-    async def get_review_queue(count: int = 1) -> dict:
+    @catch_errors
+    async def get_review_queue(runnable_config: RunnableConfig, count: int = 1) -> dict:
         """Recupere les prochains tickets a revoir dans la file de priorite
         (tickets ambigus, faible confiance). Utilise cet outil quand l'utilisateur
         dit 'ticket suivant', 'prochain a revoir', 'montre les ambigus'."""
-        from app.services.learning.feedback_learning import get_priority_queue
-        queue = await get_priority_queue(config.id, db, limit=count)
+        from app.services.learning.review_queue import (
+            claim_review_items,
+            release_reviewer_items,
+        )
+        config = _active_config(runnable_config)
+        reviewer = _reviewer(runnable_config)
+        async with async_session() as db:
+            await release_reviewer_items(config.id, reviewer, db)
+            queue = await claim_review_items(config.id, reviewer, db, count=count)
         if queue:
             return {"tickets": queue, "count": len(queue)}
         return {"tickets": [], "count": 0, "message": "Aucun ticket en attente de revision."}
 
     @tool
-    @with_rollback
-    async def get_stats() -> dict:
+    @catch_errors
+    @cached_read
+    async def get_stats(runnable_config: RunnableConfig) -> dict:
         """Recupere les statistiques et KPIs de classification : total,
         confiance moyenne, taux challenger, feedbacks, taux de correction.
         Utilise cet outil quand l'utilisateur demande des stats, performances,
         ou comment ca progresse."""
         from app.services.analytics.analytics_computation import compute_kpis
-        return await compute_kpis(config.id, db)
+        config = _active_config(runnable_config)
+        async with async_session() as db:
+            return await compute_kpis(config.id, db)
 
     @tool
-    @with_rollback
-    async def get_improvement_suggestions() -> dict:
+    @catch_errors
+    @cached_read
+    async def get_improvement_suggestions(runnable_config: RunnableConfig) -> dict:
         """Analyse les patterns d'erreur et propose des suggestions
         d'amelioration du systeme de classification.
         Utilise cet outil quand l'utilisateur demande comment ameliorer
         le systeme ou veut des recommandations."""
         from app.services.learning.error_pattern_detector import generate_suggestions
-        raw_suggestions = await generate_suggestions(config.id, db)
+        config = _active_config(runnable_config)
+        async with async_session() as db:
+            raw_suggestions = await generate_suggestions(config.id, db)
         return {"suggestions": raw_suggestions}
 
     @tool
-    @with_rollback
-    async def get_config_info() -> dict:
+    @catch_errors
+    async def get_config_info(runnable_config: RunnableConfig) -> dict:
         """Recupere les informations sur la configuration active :
         nom, description, axes de classification et categories disponibles.
         Utilise cet outil quand l'utilisateur demande des infos sur la config,
         les axes, les categories, ou comment le systeme est configure."""
+        config = _active_config(runnable_config)
         axes_info = []
         for axis in sorted(config.axes, key=lambda a: a.position):
             categories = [
@@ -122,15 +203,18 @@ def create_agent_tools(config: Config, db: AsyncSession) -> list:
         }
 
     @tool
-    @with_rollback
-    async def classify_batch(texts: list[str]) -> dict:
+    @catch_errors
+    @invalidates_reads
+    async def classify_batch(texts: list[str], runnable_config: RunnableConfig) -> dict:
         """Classifie plusieurs tickets en une seule operation.
         Utilise cet outil quand l'utilisateur colle plusieurs textes
         ou demande de classifier un lot de tickets d'un coup."""
         from app.services.classification.classification_pipeline import (
             classify_batch as do_classify_batch,
         )
-        results = await do_classify_batch(texts, config, db)
+        config = _active_config(runnable_config)
+        async with async_session() as db:
+            results = await do_classify_batch(texts, config, db)
         return {
             "count": len(results),
             "results": [
@@ -145,25 +229,28 @@ def create_agent_tools(config: Config, db: AsyncSession) -> list:
         }
 
     @tool
-    @with_rollback
-    async def get_learned_rules() -> dict:
+    @catch_errors
+    @cached_read
+    async def get_learned_rules(runnable_config: RunnableConfig) -> dict:
         """Recupere les regles apprises par le systeme a partir des feedbacks utilisateur.
         Utilise cet outil quand l'utilisateur demande ce que le systeme a appris,
         quelles regles sont actives, ou comment les feedbacks ont influence le classifieur."""
         from sqlalchemy.orm import selectinload
         from app.models.learned_rule import LearnedRule
+        config = _active_config(runnable_config)
 
-        result = await db.execute(
-            select(LearnedRule)
-            .options(selectinload(LearnedRule.axis))
-            .where(
-                LearnedRule.config_id == config.id,
-                LearnedRule.active == True,
-                LearnedRule.validated_by_user == True,
+        async with async_session() as db:
+            result = await db.execute(
+                select(LearnedRule)
+                .options(selectinload(LearnedRule.axis))
+                .where(
+                    LearnedRule.config_id == config.id,
+                    LearnedRule.active == True,
+                    LearnedRule.validated_by_user == True,
+                )
+                .order_by(LearnedRule.created_at)
             )
-            .order_by(LearnedRule.created_at)
-        )
-        rules = list(result.scalars().all())
+            rules = list(result.scalars().all())
 
         if not rules:
             return {"rules": [], "message": "Aucune regle apprise pour le moment."}
@@ -181,14 +268,17 @@ def create_agent_tools(config: Config, db: AsyncSession) -> list:
         }
 
     @tool
-    @with_rollback
-    async def get_version_history() -> dict:
+    @catch_errors
+    @cached_read
+    async def get_version_history(runnable_config: RunnableConfig) -> dict:
         """Recupere l'historique des versions du systeme de prompts :
         quand et pourquoi les prompts ont change.
         Utilise cet outil quand l'utilisateur demande l'historique,
         les changements recents, ou l'evolution du systeme."""
         from app.services.config.prompt_versioning import get_version_history as do_get_history
-        versions = await do_get_history(config.id, db)
+        config = _active_config(runnable_config)
+        async with async_session() as db:
+            versions = await do_get_history(config.id, db)
         if not versions:
             return {"versions": [], "message": "Aucun historique de version."}
         return {
@@ -1,46 +1,58 @@
-from collections import defaultdict
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict, defaultdict
+from typing import NamedTuple
 from uuid import UUID
 
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.compute import run_cpu_bound, share_array
+from app.core.config import settings
+from app.core.database import async_session
 from app.models.classification_result import ClassificationResult
 from app.models.user_feedback import UserFeedback
+from app.services.analytics.cpu_tasks import aggregate_axes_stats, project_embeddings
 
+EMBEDDING_TILE_MAX_POINTS = 2000
+EMBEDDING_BIN_MIN_ZOOM = 3
+EMBEDDING_BIN_GRID = 32
 
-async def compute_kpis(config_id: UUID, db: AsyncSession) -> dict:
-    total_stmt = (
-        select(func.count())
-        .select_from(ClassificationResult)
-        .where(ClassificationResult.config_id == config_id)
-    )
-    total = (await db.execute(total_stmt)).scalar() or 0
+logger = logging.getLogger(__name__)
 
-    avg_stmt = (
-        select(func.avg(ClassificationResult.overall_confidence))
-        .where(ClassificationResult.config_id == config_id)
-    )
-    avg_confidence = (await db.execute(avg_stmt)).scalar()
 
-    challenged_stmt = (
-        select(func.count())
-        .select_from(ClassificationResult)
-        .where(
-            ClassificationResult.config_id == config_id,
-            ClassificationResult.was_challenged.is_(True),
-        )
-    )
-    challenged = (await db.execute(challenged_stmt)).scalar() or 0
+class _Projection(NamedTuple):
+    count: int
+    fitted_at: float
+    points: list[dict]
+
+
+_projection_cache: OrderedDict[UUID, _Projection] = OrderedDict()
+_projection_refits: dict[UUID, asyncio.Task] = {}
 
-    feedback_stmt = (
+
+async def compute_kpis(config_id: UUID, db: AsyncSession) -> dict:
+    feedback_count = (
         select(func.count())
         .select_from(UserFeedback)
         .where(UserFeedback.classification_id.in_(
             select(ClassificationResult.id)
             .where(ClassificationResult.config_id == config_id)
         ))
+        .scalar_subquery()
     )
-    feedback_count = (await db.execute(feedback_stmt)).scalar() or 0
+    stmt = (
+        select(
+            func.count(),
+            func.avg(ClassificationResult.overall_confidence),
+            func.count().filter(ClassificationResult.was_challenged.is_(True)),
+            feedback_count,
+        )
+        .where(ClassificationResult.config_id == config_id)
+    )
+    total, avg_confidence, challenged, feedback_count = (await db.execute(stmt)).one()
 
     return {
         "total_classifications": total,
@@ -96,62 +108,14 @@ async def compute_axes_stats(config_id: UUID, db: AsyncSession) -> list[dict]:
     )
     fb_rows = (await db.execute(fb_stmt)).all()
 
-    fb_by_classif: dict[UUID, dict[UUID, str]] = defaultdict(dict)
-    for fb in fb_rows:
-        fb_by_classif[fb.classification_id][fb.axis_id] = fb.feedback_type
-
-    axis_stats: dict[str, dict] = {}
-
-    for row in classif_rows:
-        results_list = row.results if isinstance(row.results, list) else (row.results or {}).get("results", [])
-        fbs = fb_by_classif.get(row.id, {})
-
-        for r in results_list:
-            axis_name = r.get("axis_name", "")
-            cat_name = r.get("category_name", "")
-
-            if axis_name not in axis_stats:
-                axis_stats[axis_name] = {
-                    "total": 0,
-                    "correct": 0,
-                    "with_feedback": 0,
-                    "categories": defaultdict(int),
-                }
-            axis_stats[axis_name]["categories"][cat_name] += 1
-            axis_stats[axis_name]["total"] += 1
-
-            axis_id_str = r.get("axis_id")
-            if axis_id_str:
-                try:
-                    axis_uuid = UUID(axis_id_str) if isinstance(axis_id_str, str) else axis_id_str
-                except (ValueError, AttributeError):
-                    continue
-                fb_type = fbs.get(axis_uuid)
-                if fb_type is not None:
-                    axis_stats[axis_name]["with_feedback"] += 1
-                    if fb_type == "validated":
-                        axis_stats[axis_name]["correct"] += 1
-
-    result = []
-    for axis_name, stats in axis_stats.items():
-        correct = stats["correct"]
-        with_feedback = stats["with_feedback"]
-        accuracy = round(correct / with_feedback, 3) if with_feedback > 0 else None
-
-        cats = stats["categories"]
-        top_categories = sorted(cats.items(), key=lambda x: -x[1])[:5]
-
-        result.append({
-            "axis_name": axis_name,
-            "accuracy": accuracy,
-            "total_classifications": stats["total"],
-            "feedback_count": with_feedback,
-            "top_categories": [
-                {"name": name, "count": count} for name, count in top_categories
-            ],
-        })
-
-    return result
+    return await run_cpu_bound(
+        aggregate_axes_stats,
+        [(str(row.id), row.results) for row in classif_rows],
+        [
+            (str(fb.classification_id), str(fb.axis_id), fb.feedback_type)
+            for fb in fb_rows
+        ],
+    )
 
 
 async def compute_classification_matrix(
@@ -234,7 +198,55 @@ async def compute_classification_matrix(
     }
 
 
-async def compute_embedding_map(config_id: UUID, db: AsyncSession) -> list[dict]:
+async def _get_projected_points(config_id: UUID, db: AsyncSession) -> list[dict]:
+    count_stmt = select(func.count()).where(
+        ClassificationResult.config_id == config_id,
+        ClassificationResult.embedding.isnot(None),
+    )
+    count = (await db.execute(count_stmt)).scalar_one()
+
+    cached = _projection_cache.get(config_id)
+    if cached is None:
+        projection = await _fit_projection(config_id, db)
+        if projection is None:
+            return []
+        _store_projection(config_id, projection)
+        return projection.points
+
+    _projection_cache.move_to_end(config_id)
+    if _needs_refit(cached, count) and config_id not in _projection_refits:
+        _projection_refits[config_id] = asyncio.create_task(_refit_projection(config_id))
+    return cached.points
+
+
+def _needs_refit(projection: _Projection, count: int) -> bool:
+    if count == projection.count:
+        return False
+    drift = abs(count - projection.count) / max(projection.count, 1)
+    age = time.monotonic() - projection.fitted_at
+    return drift >= settings.embedding_map_refit_ratio or age >= settings.embedding_map_refit_seconds
+
+
+def _store_projection(config_id: UUID, projection: _Projection) -> None:
+    _projection_cache[config_id] = projection
+    _projection_cache.move_to_end(config_id)
+    while len(_projection_cache) > settings.embedding_map_cache_configs:
+        _projection_cache.popitem(last=False)
+
+
+async def _refit_projection(config_id: UUID) -> None:
+    try:
+        async with async_session() as db:
+            projection = await _fit_projection(config_id, db)
+        if projection is not None:
+            _store_projection(config_id, projection)
+    except Exception:
+        logger.exception("Echec du recalcul de la projection UMAP pour la config %s", config_id)
+    finally:
+        _projection_refits.pop(config_id, None)
+
+
+async def _fit_projection(config_id: UUID, db: AsyncSession) -> _Projection | None:
     stmt = (
         select(
             ClassificationResult.id,
@@ -251,19 +263,19 @@ async def compute_embedding_map(config_id: UUID, db: AsyncSession) -> list[dict]
     rows = (await db.execute(stmt)).all()
 
     if len(rows) < 5:
-        return []
+        return None
 
     try:
         import numpy as np
-        from umap import UMAP
+        import umap  # noqa: F401
     except ImportError:
-        return []
+        return None
 
-    embeddings = np.array([list(row.embedding) for row in rows])
+    embeddings = np.asarray([row.embedding for row in rows], dtype=np.float32)
 
     n_neighbors = min(15, len(rows) - 1)
-    reducer = UMAP(n_components=2, n_neighbors=n_neighbors, random_state=42)
-    coords = reducer.fit_transform(embeddings)
+    with share_array(embeddings) as ref:
+        coords = await run_cpu_bound(project_embeddings, ref, n_neighbors)
 
     points = []
     for i, row in enumerate(rows):
@@ -272,11 +284,138 @@ async def compute_embedding_map(config_id: UUID, db: AsyncSession) -> list[dict]
 
         points.append({
             "id": str(row.id),
-            "x": round(float(coords[i][0]), 4),
-            "y": round(float(coords[i][1]), 4),
+            "x": coords[i][0],
+            "y": coords[i][1],
             "label": row.input_text[:60],
             "category": main_cat,
             "confidence": row.overall_confidence,
         })
 
-    return points
+    return _Projection(len(rows), time.monotonic(), points)
+
+
+async def compute_embedding_map(config_id: UUID, db: AsyncSession) -> list[dict]:
+    return await _get_projected_points(config_id, db)
+
+
+def _stratified_sample(points: list[dict], size: int) -> list[dict]:
+    by_category: dict[str, list[dict]] = defaultdict(list)
+    for p in points:
+        by_category[p["category"]].append(p)
+
+    rng = random.Random(42)
+    total = len(points)
+    sample = []
+    for members in by_category.values():
+        quota = max(1, round(size * len(members) / total))
+        sample.extend(rng.sample(members, min(quota, len(members))))
+
+    if len(sample) > size:
+        sample = rng.sample(sample, size)
+    return sample
+
+
+def _density_bins(
+    points: list[dict],
+    x_min: float,
+    x_max: float,
+    y_min: float,
+    y_max: float,
+) -> list[dict]:
+    grid = EMBEDDING_BIN_GRID
+    width = (x_max - x_min) / grid or 1.0
+    height = (y_max - y_min) / grid or 1.0
+
+    cells: dict[tuple[int, int], dict] = {}
+    for p in points:
+        col = min(int((p["x"] - x_min) / width), grid - 1)
+        row = min(int((p["y"] - y_min) / height), grid - 1)
+        cell = cells.setdefault((col, row), {
+            "count": 0,
+            "confidence_sum": 0.0,
+            "categories": defaultdict(int),
+        })
+        cell["count"] += 1
+        cell["confidence_sum"] += p["confidence"]
+        cell["categories"][p["category"]] += 1
+
+    bins = []
+    for (col, row), cell in cells.items():
+        categories = cell["categories"]
+        bins.append({
+            "x": round(x_min + (col + 0.5) * width, 4),
+            "y": round(y_min + (row + 0.5) * height, 4),
+            "width": round(width, 4),
+            "height": round(height, 4),
+            "count": cell["count"],
+            "avg_confidence": round(cell["confidence_sum"] / cell["count"], 3),
+            "dominant_category": max(categories, key=categories.get),
+            "category_counts": dict(categories),
+        })
+    return bins
+
+
+async def compute_embedding_tile(
+    config_id: UUID,
+    db: AsyncSession,
+    zoom: int = 0,
+    x_min: float | None = None,
+    x_max: float | None = None,
+    y_min: float | None = None,
+    y_max: float | None = None,
+) -> dict:
+    points = await _get_projected_points(config_id, db)
+
+    if not points:
+        return {
+            "mode": "points",
+            "zoom": zoom,
+            "total": 0,
+            "visible": 0,
+            "bounds": None,
+            "viewport": None,
+            "points": [],
+            "bins": [],
+        }
+
+    bounds = {
+        "x_min": min(p["x"] for p in points),
+        "x_max": max(p["x"] for p in points),
+        "y_min": min(p["y"] for p in points),
+        "y_max": max(p["y"] for p in points),
+    }
+    viewport = {
+        "x_min": bounds["x_min"] if x_min is None else x_min,
+        "x_max": bounds["x_max"] if x_max is None else x_max,
+        "y_min": bounds["y_min"] if y_min is None else y_min,
+        "y_max": bounds["y_max"] if y_max is None else y_max,
+    }
+
+    visible = [
+        p for p in points
+        if viewport["x_min"] <= p["x"] <= viewport["x_max"]
+        and viewport["y_min"] <= p["y"] <= viewport["y_max"]
+    ]
+
+    tile_points: list[dict] = []
+    bins: list[dict] = []
+    if len(visible) <= EMBEDDING_TILE_MAX_POINTS:
+        mode = "points"
+        tile_points = visible
+    elif zoom < EMBEDDING_BIN_MIN_ZOOM:
+        mode = "sample"
+        tile_points = _stratified_sample(visible, EMBEDDING_TILE_MAX_POINTS)
+    else:
+        mode = "bins"
+        bins = _density_bins(visible, **viewport)
+
+    return {
+        "mode": mode,
+        "zoom": zoom,
+        "total": len(points),
+        "visible": len(visible),
+        "bounds": bounds,
+        "viewport": viewport,
+        "points": tile_points,
+        "bins": bins,
+    }
@@ -0,0 +1,76 @@
+from collections import defaultdict
+from uuid import UUID
+
+from app.core.compute import SharedArray, attach_array
+
+
+def project_embeddings(ref: SharedArray, n_neighbors: int) -> list[tuple[float, float]]:
+    from umap import UMAP
+
+    with attach_array(ref) as embeddings:
+        reducer = UMAP(n_components=2, n_neighbors=n_neighbors, random_state=42)
+        coords = reducer.fit_transform(embeddings)
+
+    return [(round(float(x), 4), round(float(y), 4)) for x, y in coords]
+
+
+def aggregate_axes_stats(
+    classif_rows: list[tuple[str, list | dict | None]],
+    fb_rows: list[tuple[str, str, str]],
+) -> list[dict]:
+    fb_by_classif: dict[str, dict[str, str]] = defaultdict(dict)
+    for classification_id, axis_id, feedback_type in fb_rows:
+        fb_by_classif[classification_id][axis_id] = feedback_type
+
+    axis_stats: dict[str, dict] = {}
+
+    for classification_id, results in classif_rows:
+        results_list = results if isinstance(results, list) else (results or {}).get("results", [])
+        fbs = fb_by_classif.get(classification_id, {})
+
+        for r in results_list:
+            axis_name = r.get("axis_name", "")
+            cat_name = r.get("category_name", "")
+
+            if axis_name not in axis_stats:
+                axis_stats[axis_name] = {
+                    "total": 0,
+                    "correct": 0,
+                    "with_feedback": 0,
+                    "categories": defaultdict(int),
+                }
+            axis_stats[axis_name]["categories"][cat_name] += 1
+            axis_stats[axis_name]["total"] += 1
+
+            axis_id_str = r.get("axis_id")
+            if axis_id_str:
+                try:
+                    axis_key = str(UUID(str(axis_id_str)))
+                except (ValueError, AttributeError):
+                    continue
+                fb_type = fbs.get(axis_key)
+                if fb_type is not None:
+                    axis_stats[axis_name]["with_feedback"] += 1
+                    if fb_type == "validated":
+                        axis_stats[axis_name]["correct"] += 1
+
+    result = []
+    for axis_name, stats in axis_stats.items():
+        correct = stats["correct"]
+        with_feedback = stats["with_feedback"]
+        accuracy = round(correct / with_feedback, 3) if with_feedback > 0 else None
+
+        cats = stats["categories"]
+        top_categories = sorted(cats.items(), key=lambda x: -x[1])[:5]
+
+        result.append({
+            "axis_name": axis_name,
+            "accuracy": accuracy,
+            "total_classifications": stats["total"],
+            "feedback_count": with_feedback,
+            "top_categories": [
+                {"name": name, "count": count} for name, count in top_categories
+            ],
+        })
+
+    return result
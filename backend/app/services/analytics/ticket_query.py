@@ -1,44 +1,115 @@
-import json
+import asyncio
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
-from sqlalchemy import select, func, or_, text, cast
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import select, func, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from langchain_core.messages import HumanMessage
 
+from app.core.config import settings
+from app.core.database import async_session
 from app.core.llm import classifier_llm
 from app.models.classification_result import ClassificationResult
+from app.models.config import Config
 from app.models.user_feedback import UserFeedback
-from app.prompts.ticket_query import TICKET_QUERY_PROMPT, TICKET_QUERY_SEMANTIC_PROMPT
-from app.schemas.llm_outputs import TicketQueryOutput, SemanticQueryOutput
+from app.prompts.ticket_query import TICKET_QUERY_PROMPT
+from app.schemas.llm_outputs import TicketQueryFilters, TicketQueryOutput
 from app.services.shared.prompt_helpers import build_axes_text
+from app.services.shared.result_filters import category_condition
+from app.services.shared.text_search import matches_search, search_headline
 from app.services.shared.vector_search import compute_embedding
 
+from .ticket_query_parser import fast_parse_ticket_query, normalize_query
+
+PARSED_QUERY_CACHE_SIZE = 512
+
+_parsed_query_cache: OrderedDict[tuple, TicketQueryOutput] = OrderedDict()
+
+UNPARSED_QUERY_RESULT = {
+    "interpretation": "Impossible de comprendre la requete.",
+    "total_count": 0,
+    "results": [],
+}
 
-async def query_tickets_natural_language(
-    message: str, config_id: UUID, db: AsyncSession
-) -> dict:
-    from app.services.config.config_management import get_config_with_relations
 
-    config = await get_config_with_relations(config_id, db)
-    axes_text = build_axes_text(config)
+async def _parse_with_llm(message: str, config: Config) -> TicketQueryOutput | None:
+    key = (config.id, config.updated_at, normalize_query(message))
+    cached = _parsed_query_cache.get(key)
+    if cached is not None:
+        _parsed_query_cache.move_to_end(key)
+        return cached
 
     structured_llm = classifier_llm.with_structured_output(TicketQueryOutput)
     try:
         parsed = await structured_llm.ainvoke([
             HumanMessage(content=TICKET_QUERY_PROMPT.format(
-                axes_and_categories=axes_text, message=message,
+                axes_and_categories=build_axes_text(config), message=message,
             )),
         ])
     except Exception:
-        return {
-            "interpretation": "Impossible de comprendre la requete.",
-            "total_count": 0,
-            "results": [],
-        }
+        return None
+
+    _parsed_query_cache[key] = parsed
+    if len(_parsed_query_cache) > PARSED_QUERY_CACHE_SIZE:
+        _parsed_query_cache.popitem(last=False)
+    return parsed
+
+
+async def search_tickets_hybrid(message: str, config_id: UUID) -> dict:
+    from app.services.config.config_management import get_config_with_relations
+
+    async with async_session() as db:
+        config = await get_config_with_relations(config_id, db)
+
+    parsed = fast_parse_ticket_query(message, config)
+    if parsed is not None:
+        async with async_session() as db:
+            return await _run_structured_query(parsed, config_id, db)
+
+    parsed, embedding = await asyncio.gather(
+        _parse_with_llm(message, config), _embedding_or_none(message)
+    )
+    if parsed is None and embedding is None:
+        return dict(UNPARSED_QUERY_RESULT)
+    if embedding is None or (parsed is not None and parsed.aggregation == "count"):
+        async with async_session() as db:
+            return await _run_structured_query(parsed, config_id, db)
+
+    async def _structured() -> dict | None:
+        if parsed is None:
+            return None
+        async with async_session() as db:
+            return await _run_structured_query(parsed, config_id, db)
+
+    async def _semantic() -> dict:
+        async with async_session() as db:
+            return await _run_semantic_query(
+                message,
+                embedding,
+                config_id,
+                db,
+                min(parsed.limit if parsed else 20, 100),
+                parsed.filters if parsed else None,
+            )
 
+    structured, semantic = await asyncio.gather(_structured(), _semantic())
+    if structured is None or (structured["total_count"] == 0 and not structured["results"]):
+        return semantic
+    return structured
+
+
+async def _embedding_or_none(message: str) -> list[float] | None:
+    try:
+        return await compute_embedding(message)
+    except Exception:
+        return None
+
+
+async def _run_structured_query(
+    parsed: TicketQueryOutput, config_id: UUID, db: AsyncSession
+) -> dict:
     filters = parsed.filters
     sort_by = parsed.sort
     limit = min(parsed.limit, 100)
@@ -48,14 +119,7 @@ async def query_tickets_natural_language(
         ClassificationResult.config_id == config_id
     )
 
-    query = _apply_date_filter(query, filters.date_range)
-    query = _apply_confidence_filters(
-        query, filters.confidence_min, filters.confidence_max
-    )
-    query = _apply_challenged_filter(query, filters.was_challenged)
-    query = _apply_feedback_filter(query, filters.has_feedback)
-    query = _apply_text_search(query, filters.text_search)
-    query = _apply_axes_filters(query, filters.axes)
+    query = _apply_ticket_filters(query, filters)
 
     if aggregation == "count":
         count_q = select(func.count()).select_from(query.subquery())
@@ -67,69 +131,95 @@ async def query_tickets_natural_language(
             "results": [],
         }
 
+    if filters.text_search:
+        query = query.add_columns(search_headline(filters.text_search).label("headline"))
     query = _apply_sort(query, sort_by)
     query = query.limit(limit)
 
     result = await db.execute(query)
-    rows = list(result.scalars().all())
+    rows = result.all()
 
     return {
         "interpretation": _build_interpretation(filters, len(rows)),
         "total_count": len(rows),
-        "results": [_format_result(r) for r in rows],
+        "results": [
+            _format_result(row[0], headline=row.headline if filters.text_search else None)
+            for row in rows
+        ],
     }
 
 
-async def query_tickets_semantic(
-    message: str, config_id: UUID, db: AsyncSession, limit: int = 20
+async def _run_semantic_query(
+    search_text: str,
+    embedding: list[float],
+    config_id: UUID,
+    db: AsyncSession,
+    result_limit: int,
+    filters: TicketQueryFilters | None = None,
 ) -> dict:
-    structured_llm = classifier_llm.with_structured_output(SemanticQueryOutput)
-    try:
-        output = await structured_llm.ainvoke([
-            HumanMessage(content=TICKET_QUERY_SEMANTIC_PROMPT.format(message=message)),
-        ])
-        search_text = output.search_text
-        result_limit = min(output.limit, 100)
-    except Exception:
-        search_text = message
-        result_limit = min(limit, 100)
-
-    embedding = await compute_embedding(search_text)
-
-    sql = text("""
-        SELECT id, input_text, results, overall_confidence,
-               was_challenged, challenger_response, created_at,
-               embedding <=> :embedding AS distance
-        FROM classification_results
-        WHERE config_id = :config_id
-          AND embedding IS NOT NULL
-        ORDER BY embedding <=> :embedding
-        LIMIT :limit
-    """)
-
-    result = await db.execute(
-        sql,
-        {"embedding": str(embedding), "config_id": str(config_id), "limit": result_limit},
+    distance = ClassificationResult.embedding.cosine_distance(embedding)
+    candidates = select(ClassificationResult.id, distance.label("distance")).where(
+        ClassificationResult.config_id == config_id,
+        ClassificationResult.embedding.is_not(None),
     )
-    rows = result.fetchall()
-
+    if filters is not None:
+        filters = filters.model_copy(update={"text_search": None})
+        candidates = _apply_ticket_filters(candidates, filters)
+
+    await _widen_ann_scan(db)
+    nearest = candidates.order_by(distance).limit(result_limit).subquery()
+    rows = (await db.execute(_with_classifications(nearest))).all()
+    if len(rows) < result_limit:
+        exact = candidates.cte("candidates").prefix_with("MATERIALIZED")
+        rows = (await db.execute(_with_classifications(exact).limit(result_limit))).all()
+
+    interpretation = f"Les {len(rows)} tickets les plus similaires a '{search_text}'."
+    described = _describe_filters(filters) if filters is not None else None
+    if described:
+        interpretation = f"{interpretation} Filtres : {described}."
     return {
-        "interpretation": f"Les {len(rows)} tickets les plus similaires a '{search_text}'.",
+        "interpretation": interpretation,
         "total_count": len(rows),
         "results": [
             {
-                "id": str(row.id),
-                "text_preview": row.input_text[:150] + ("..." if len(row.input_text) > 150 else ""),
-                "classification": _simplify_results(row.results),
-                "confidence": row.overall_confidence,
-                "created_at": row.created_at.isoformat() if row.created_at else None,
-                "similarity": round(1 - row.distance, 3),
+                **_format_result(classification),
+                "similarity": round(1 - distance_value, 3),
             }
-            for row in rows
+            for classification, distance_value in rows
         ],
     }
 
 
+async def _widen_ann_scan(db: AsyncSession) -> None:
+    await db.execute(text(
+        f"SET LOCAL hnsw.ef_search = {int(settings.semantic_search_ef_search)}"
+    ))
+    if settings.semantic_search_iterative_scan:
+        await db.execute(
+            text("SELECT set_config('hnsw.iterative_scan', :mode, true)"),
+            {"mode": settings.semantic_search_iterative_scan},
+        )
+
+
+def _with_classifications(candidates):
+    return (
+        select(ClassificationResult, candidates.c.distance)
+        .join(candidates, candidates.c.id == ClassificationResult.id)
+        .order_by(candidates.c.distance)
+    )
+
+
+def _apply_ticket_filters(query, filters: TicketQueryFilters):
+    query = _apply_date_filter(query, filters.date_range)
+    query = _apply_confidence_filters(
+        query, filters.confidence_min, filters.confidence_max
+    )
+    query = _apply_challenged_filter(query, filters.was_challenged)
+    query = _apply_feedback_filter(query, filters.has_feedback)
+    query = _apply_text_search(query, filters.text_search)
+    return _apply_axes_filters(query, filters.axes)
+
+
 def _apply_date_filter(query, date_range):
     if not date_range or date_range == "all":
         return query
@@ -181,15 +271,7 @@ def _apply_feedback_filter(query, has_feedback):
 
 def _apply_text_search(query, text_search):
     if text_search:
-        escaped = (
-            text_search
-            .replace("\\", "\\\\")
-            .replace("%", "\\%")
-            .replace("_", "\\_")
-        )
-        query = query.where(
-            ClassificationResult.input_text.ilike(f"%{escaped}%")
-        )
+        query = query.where(matches_search(text_search))
     return query
 
 
@@ -199,13 +281,7 @@ def _apply_axes_filters(query, axes_filters):
         categories = axis_filter.categories if hasattr(axis_filter, "categories") else axis_filter.get("categories", [])
         if not categories:
             continue
-        cat_conditions = []
-        for cat in categories:
-            target = json.dumps([{"axis_name": axis_name, "category_name": cat}])
-            cat_conditions.append(
-                ClassificationResult.results.op("@>")(cast(target, JSONB))
-            )
-        query = query.where(or_(*cat_conditions))
+        query = query.where(category_condition(axis_name, categories))
     return query
 
 
@@ -219,8 +295,8 @@ def _apply_sort(query, sort_by):
     return query.order_by(sort_map.get(sort_by, ClassificationResult.created_at.desc()))
 
 
-def _format_result(classification: ClassificationResult) -> dict:
-    return {
+def _format_result(classification: ClassificationResult, headline: str | None = None) -> dict:
+    formatted = {
         "id": str(classification.id),
         "text_preview": classification.input_text[:150] + (
             "..." if len(classification.input_text) > 150 else ""
@@ -230,6 +306,9 @@ def _format_result(classification: ClassificationResult) -> dict:
         "was_challenged": classification.was_challenged,
         "created_at": classification.created_at.isoformat() if classification.created_at else None,
     }
+    if headline is not None:
+        formatted["headline"] = headline
+    return formatted
 
 
 def _simplify_results(results: list[dict] | None) -> dict:
@@ -239,6 +318,11 @@ def _simplify_results(results: list[dict] | None) -> dict:
 
 
 def _build_interpretation(filters, count: int) -> str:
+    interpretation = _describe_filters(filters) or "Tous les tickets"
+    return f"{interpretation} — {count} resultat(s)"
+
+
+def _describe_filters(filters) -> str:
     parts = []
     for axis_filter in filters.axes:
         name = axis_filter.axis_name if hasattr(axis_filter, "axis_name") else axis_filter.get("axis_name", "")
@@ -259,5 +343,12 @@ def _build_interpretation(filters, count: int) -> str:
     if conf_min is not None:
         parts.append(f"confiance >= {int(conf_min * 100)}%")
 
-    interpretation = " | ".join(parts) if parts else "Tous les tickets"
-    return f"{interpretation} — {count} resultat(s)"
+    conf_max = filters.confidence_max if hasattr(filters, "confidence_max") else filters.get("confidence_max")
+    if conf_max is not None:
+        parts.append(f"confiance <= {int(conf_max * 100)}%")
+
+    text_search = filters.text_search if hasattr(filters, "text_search") else filters.get("text_search")
+    if text_search:
+        parts.append(f"texte : \"{text_search}\"")
+
+    return " | ".join(parts)
@@ -0,0 +1,111 @@
+import re
+import unicodedata
+
+from app.models.config import Config
+from app.schemas.llm_outputs import AxisFilter, TicketQueryFilters, TicketQueryOutput
+
+DATE_PATTERNS = [
+    (re.compile(r"\b(?:aujourd ?hui|du jour|today)\b"), "today"),
+    (re.compile(r"\b(?:cette semaine|semaine derniere|7 derniers jours|last week)\b"), "last_week"),
+    (re.compile(r"\b(?:ce mois(?: ci)?|mois dernier|30 derniers jours|last month)\b"), "last_month"),
+]
+CONFIDENCE_MIN = re.compile(
+    r"\bconfiance\s*(?:>=?|superieure?(?: ou egale?)? a|au dessus de|de plus de|d au moins|"
+    r"au moins|min(?:imum)?)\s*(\d{1,3})\s*%?"
+)
+CONFIDENCE_MAX = re.compile(
+    r"\bconfiance\s*(?:<=?|inferieure?(?: ou egale?)? a|en dessous de|de moins de|"
+    r"max(?:imum)?)\s*(\d{1,3})\s*%?"
+)
+SORT_PATTERNS = [
+    (re.compile(r"\bplus recents?\b"), "created_at_desc"),
+    (re.compile(r"\bplus anciens?\b"), "created_at_asc"),
+    (re.compile(r"\b(?:moins confiants?|confiance la plus (?:basse|faible))\b"), "confidence_asc"),
+    (re.compile(r"\b(?:plus confiants?|confiance la plus (?:haute|elevee))\b"), "confidence_desc"),
+]
+LIMIT = re.compile(r"\b(?:les|top)\s+(\d{1,3})\b(?:\s+(?:derniers|premiers))?")
+CHALLENGED = re.compile(r"\b(?:challenges?|contestes?)\b")
+WITHOUT_FEEDBACK = re.compile(r"\bsans (?:aucun )?feedbacks?\b")
+WITH_FEEDBACK = re.compile(r"\b(?:avec (?:un |des )?feedbacks?|corriges?)\b")
+COUNT = re.compile(r"^\s*combien\b")
+
+FILLER_WORDS = {
+    "a", "affiche", "afficher", "ai", "avec", "axe", "categorie", "categories", "ce",
+    "cherche", "classe", "classes", "classifie", "classifies", "d", "dans",
+    "de", "des", "donne", "du", "en", "est", "et", "il", "j", "je", "l", "la", "le",
+    "les", "liste", "lister", "me", "mes", "moi", "montre", "montrer", "ont", "ou",
+    "par", "plait", "pour", "quel", "quelle", "quelles", "quels", "qui", "s", "sont",
+    "stp", "sur", "svp", "ticket", "tickets", "tous", "tout", "toutes", "trouve",
+    "un", "une", "veux", "voir", "y",
+}
+
+
+def normalize_query(message: str) -> str:
+    text = unicodedata.normalize("NFKD", message)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = re.sub(r"[^a-z0-9%<>=]+", " ", text)
+    return " ".join(text.split())
+
+
+def fast_parse_ticket_query(message: str, config: Config) -> TicketQueryOutput | None:
+    remaining = f" {normalize_query(message)} "
+    filters = TicketQueryFilters()
+    output = TicketQueryOutput(filters=filters)
+
+    def consume(pattern: re.Pattern) -> re.Match | None:
+        nonlocal remaining
+        match = pattern.search(remaining)
+        if match:
+            remaining = remaining[: match.start()] + " " + remaining[match.end() :]
+        return match
+
+    if consume(COUNT):
+        output.aggregation = "count"
+    for pattern, date_range in DATE_PATTERNS:
+        if consume(pattern):
+            filters.date_range = date_range
+            break
+    if match := consume(CONFIDENCE_MIN):
+        filters.confidence_min = min(int(match.group(1)), 100) / 100
+    if match := consume(CONFIDENCE_MAX):
+        filters.confidence_max = min(int(match.group(1)), 100) / 100
+    for pattern, sort in SORT_PATTERNS:
+        if consume(pattern):
+            output.sort = sort
+            break
+    if match := consume(LIMIT):
+        output.limit = int(match.group(1))
+    if consume(CHALLENGED):
+        filters.was_challenged = True
+    if consume(WITHOUT_FEEDBACK):
+        filters.has_feedback = False
+    elif consume(WITH_FEEDBACK):
+        filters.has_feedback = True
+
+    categories = sorted(
+        (
+            (normalize_query(category.name), axis.name, category.name)
+            for axis in config.axes
+            for category in axis.categories
+        ),
+        key=lambda c: len(c[0]),
+        reverse=True,
+    )
+    names = [name for name, _, _ in categories]
+    selected: dict[str, list[str]] = {}
+    for name, axis_name, category_name in categories:
+        if not name or not consume(re.compile(rf"\b{re.escape(name)}s?\b")):
+            continue
+        if names.count(name) > 1:
+            return None
+        selected.setdefault(axis_name, []).append(category_name)
+    filters.axes = [
+        AxisFilter(axis_name=axis_name, categories=names_)
+        for axis_name, names_ in selected.items()
+    ]
+
+    axis_words = {w for axis in config.axes for w in normalize_query(axis.name).split()}
+    leftover = [w for w in remaining.split() if w not in FILLER_WORDS | axis_words]
+    if leftover:
+        return None
+    return output
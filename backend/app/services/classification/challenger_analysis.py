@@ -3,6 +3,7 @@ import json
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from app.core.llm import challenger_llm
+from app.core.metrics import token_usage
 from app.models.config import Config
 from app.prompts.challenger import CHALLENGER_SYSTEM_PROMPT, CHALLENGER_USER_PROMPT
 from app.schemas.llm_outputs import ChallengerOutput
@@ -36,12 +37,16 @@ async def challenge_classification(
         initial_results=weak_axes_summary,
     )
 
-    structured_llm = challenger_llm.with_structured_output(ChallengerOutput)
-    output = await structured_llm.ainvoke([
+    structured_llm = challenger_llm.with_structured_output(ChallengerOutput, include_raw=True)
+    response = await structured_llm.ainvoke([
         SystemMessage(content=system_prompt),
         HumanMessage(content=user_prompt),
     ])
-    tokens = 0
+    if response["parsed"] is None:
+        raise response["parsing_error"] or ValueError("Sortie du challenger invalide")
+    output = response["parsed"]
+    usage = token_usage(response["raw"])
+    tokens = usage["prompt"] + usage["completion"]
 
     challenges = []
     for ch in output.challenges:
@@ -58,4 +63,4 @@ async def challenge_classification(
             "original_confidence": matching_weak["empirical_confidence"] if matching_weak else 0,
         })
 
-    return {"challenges": challenges, "tokens": tokens}
+    return {"challenges": challenges, "tokens": tokens, "usage": usage}
@@ -6,10 +6,13 @@ from typing import Callable
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.database import async_session
+from app.core.metrics import observe_classification
 from app.models.classification_result import ClassificationResult
 from app.models.config import Config
 from app.services.classification.challenger_analysis import challenge_classification
 from app.services.learning.learning_explainer import get_active_learned_rules
+from app.services.learning.review_queue import refresh_review_queue
 from app.services.shared.prompt_helpers import build_learned_rules_text
 from app.services.classification.self_consistency_voting import run_self_consistency
 from app.services.shared.vector_search import compute_embedding, search_similar_feedbacks
@@ -38,27 +41,39 @@ def _build_results_jsonb(vote_results: list[dict], config: Config) -> list[dict]
     return results
 
 
+def _elapsed_ms(since: float) -> int:
+    return int((time.perf_counter() - since) * 1000)
+
+
 async def _run_pipeline(
     text: str,
     config: Config,
     db: AsyncSession,
     on_step: Callable[[str, str], None] | None = None,
+    persist: bool = True,
 ) -> ClassificationResult:
     start = time.perf_counter()
     total_tokens = 0
+    stages_ms: dict[str, int | list[int]] = {}
 
     if on_step:
         on_step("embedding", "Calcul embedding...")
+    stage_start = time.perf_counter()
     embedding = await compute_embedding(text)
+    stages_ms["embedding"] = _elapsed_ms(stage_start)
 
     if on_step:
         on_step("few_shot", "Recherche exemples similaires...")
+    stage_start = time.perf_counter()
     few_shots = await search_similar_feedbacks(embedding, config.id, db)
+    stages_ms["few_shot"] = _elapsed_ms(stage_start)
     if on_step:
         on_step("few_shot", f"{len(few_shots)} exemple(s) trouve(s)")
 
+    stage_start = time.perf_counter()
     learned_rules = await get_active_learned_rules(config.id, db)
     learned_rules_text = build_learned_rules_text(learned_rules)
+    stages_ms["rules"] = _elapsed_ms(stage_start)
 
     if on_step:
         on_step("classification", "Classification multi-axes en cours...")
@@ -70,6 +85,8 @@ async def _run_pipeline(
         n=settings.self_consistency_n,
     )
     total_tokens += vote_result.get("total_tokens", 0)
+    usage = vote_result.pop("usage")
+    stages_ms["votes"] = vote_result.pop("vote_timings_ms")
 
     results_per_axis = vote_result["results_per_axis"]
     results_jsonb = _build_results_jsonb(results_per_axis, config)
@@ -101,16 +118,23 @@ async def _run_pipeline(
             axes_names = ", ".join(wa["axis_name"] for wa in weak_axes)
             on_step("challenger", f"Challenger active sur : {axes_names}")
 
+        stage_start = time.perf_counter()
         challenger_result = await challenge_classification(
             ticket_text=text,
             initial_results=results_per_axis,
             weak_axes=weak_axes,
             config=config,
         )
+        stages_ms["challenger"] = _elapsed_ms(stage_start)
         challenger_response_data = challenger_result["challenges"]
         total_tokens += challenger_result["tokens"]
+        usage = {
+            kind: usage[kind] + challenger_result["usage"][kind] for kind in usage
+        }
 
-    elapsed_ms = int((time.perf_counter() - start) * 1000)
+    elapsed_ms = _elapsed_ms(start)
+    metrics = {"stages_ms": stages_ms, "tokens": usage}
+    observe_classification(metrics)
 
     classification = ClassificationResult(
         config_id=config.id,
@@ -123,9 +147,15 @@ async def _run_pipeline(
         tokens_used=total_tokens,
         processing_time_ms=elapsed_ms,
         vote_details=vote_result,
+        metrics=metrics,
         embedding=embedding,
     )
+    if not persist:
+        return classification
+
     db.add(classification)
+    await db.flush()
+    await refresh_review_queue(config.id, db, classification_ids=[classification.id])
     await db.commit()
     await db.refresh(classification)
 
@@ -133,9 +163,9 @@ async def _run_pipeline(
 
 
 async def classify_ticket(
-    text: str, config: Config, db: AsyncSession
+    text: str, config: Config, db: AsyncSession, persist: bool = True
 ) -> ClassificationResult:
-    return await _run_pipeline(text, config, db)
+    return await _run_pipeline(text, config, db, persist=persist)
 
 
 async def classify_ticket_stream(
@@ -160,6 +190,7 @@ async def classify_ticket_stream(
             "was_challenged": classification.was_challenged,
             "challenger_response": classification.challenger_response,
             "processing_time_ms": classification.processing_time_ms,
+            "metrics": classification.metrics,
         },
     }
 
@@ -171,8 +202,8 @@ async def classify_batch(
     results: list[ClassificationResult | None] = [None] * len(texts)
 
     async def _classify_one(index: int, ticket_text: str) -> None:
-        async with semaphore:
-            results[index] = await classify_ticket(ticket_text, config, db)
+        async with semaphore, async_session() as ticket_db:
+            results[index] = await classify_ticket(ticket_text, config, ticket_db)
 
     await asyncio.gather(*[
         _classify_one(i, t) for i, t in enumerate(texts)
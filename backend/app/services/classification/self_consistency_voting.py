@@ -1,3 +1,4 @@
+import time
 from collections import Counter
 from uuid import UUID
 
@@ -6,6 +7,7 @@ from sqlalchemy import text as sa_text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.llm import classifier_llm
+from app.core.metrics import token_usage
 from app.models.config import Config
 from app.prompts.classifier import CLASSIFIER_SYSTEM_PROMPT, CLASSIFIER_USER_PROMPT
 from app.schemas.llm_outputs import ClassifierOutput
@@ -30,14 +32,17 @@ async def _single_classification(
         ticket_text=ticket_text,
     )
 
-    structured_llm = classifier_llm.with_structured_output(ClassifierOutput)
-    result = await structured_llm.ainvoke([
+    structured_llm = classifier_llm.with_structured_output(ClassifierOutput, include_raw=True)
+    output = await structured_llm.ainvoke([
         SystemMessage(content=system_prompt),
         HumanMessage(content=user_prompt),
     ])
+    if output["parsed"] is None:
+        raise output["parsing_error"] or ValueError("Sortie du classifieur invalide")
 
-    parsed = {"results": [r.model_dump() for r in result.results]}
-    return {"parsed": parsed, "tokens": 0}
+    usage = token_usage(output["raw"])
+    parsed = {"results": [r.model_dump() for r in output["parsed"].results]}
+    return {"parsed": parsed, "tokens": usage["prompt"] + usage["completion"], "usage": usage}
 
 
 async def run_self_consistency(
@@ -49,13 +54,19 @@ async def run_self_consistency(
 ) -> dict:
     raw_classifications = []
     total_tokens = 0
+    usage = {"prompt": 0, "completion": 0}
+    vote_timings_ms = []
 
     for _ in range(n):
+        started = time.perf_counter()
         result = await _single_classification(
             ticket_text, config, few_shots, learned_rules_text
         )
+        vote_timings_ms.append(int((time.perf_counter() - started) * 1000))
         raw_classifications.append(result["parsed"])
         total_tokens += result["tokens"]
+        usage["prompt"] += result["usage"]["prompt"]
+        usage["completion"] += result["usage"]["completion"]
 
     axis_lookup = {}
     for axis in config.axes:
@@ -92,6 +103,8 @@ async def run_self_consistency(
         "results_per_axis": results_per_axis,
         "raw_classifications": raw_classifications,
         "total_tokens": total_tokens,
+        "usage": usage,
+        "vote_timings_ms": vote_timings_ms,
     }
 
 
@@ -2,7 +2,7 @@ from pathlib import Path
 from uuid import UUID
 
 import yaml
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -140,10 +140,13 @@ async def create_config(data: dict, db: AsyncSession) -> Config:
 
 
 async def update_config(config_id: UUID, data: dict, db: AsyncSession) -> Config:
+    from app.services.agent import invalidate_compiled_agent
+
     config = await get_config_with_relations(config_id, db)
 
     config.name = data.get("name", config.name)
     config.description = data.get("description", config.description)
+    config.updated_at = func.now()
 
     if "axes" in data:
         for axis in list(config.axes):
@@ -170,12 +173,16 @@ async def update_config(config_id: UUID, data: dict, db: AsyncSession) -> Config
                 db.add(category)
 
     await db.commit()
+    invalidate_compiled_agent(config_id)
     return await get_config_with_relations(config.id, db)
 
 
 async def delete_config(config_id: UUID, db: AsyncSession) -> None:
+    from app.services.agent import invalidate_compiled_agent
+
     config = await db.get(Config, config_id)
     if config is None:
         raise ValueError(f"Config {config_id} not found")
     await db.delete(config)
     await db.commit()
+    invalidate_compiled_agent(config_id)
@@ -1 +1,2 @@
-from .runner import run_ground_truth_loop
+from .jobs import ground_truth_job_manager
+from .runner import get_ground_truth_run, resume_ground_truth_loop, run_ground_truth_loop
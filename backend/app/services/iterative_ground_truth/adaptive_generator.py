@@ -1,7 +1,9 @@
+import asyncio
 import json
 
 from langchain_core.messages import SystemMessage, HumanMessage
 
+from app.core.config import settings
 from app.core.llm import generator_llm
 from app.schemas.llm_outputs import ReformulationsOutput
 from app.models.config import Config
@@ -17,24 +19,65 @@ async def reformulate_tickets(
     axes_text = build_axes_text(config)
     rules_text = "\n".join(f"- {r}" for r in accumulated_rules) if accumulated_rules else "Aucune regle encore (premier round)."
 
+    system_message = SystemMessage(content=ADAPTIVE_GENERATOR_SYSTEM.format(
+        axes_and_categories=axes_text,
+        accumulated_rules=rules_text,
+    ))
+    semaphore = asyncio.Semaphore(settings.ground_truth_concurrency)
+
+    async def _run_chunks(chunks: list[list[dict]]) -> dict[str, str]:
+        merged: dict[str, str] = {}
+        for chunk_result in await asyncio.gather(*(
+            _reformulate_chunk(chunk, system_message, semaphore) for chunk in chunks
+        )):
+            merged.update(chunk_result)
+        return merged
+
+    size = max(1, settings.ground_truth_reformulation_chunk_size)
+    reformulated = await _run_chunks(
+        [tickets[i : i + size] for i in range(0, len(tickets), size)]
+    )
+
+    missing = [t for t in tickets if t["classification_id"] not in reformulated]
+    if missing and size > 1:
+        reformulated.update(await _run_chunks([[t] for t in missing]))
+
+    return [
+        {"id": t["classification_id"], "reformulated_text": reformulated[t["classification_id"]]}
+        for t in tickets
+        if t["classification_id"] in reformulated
+    ]
+
+
+async def _reformulate_chunk(
+    chunk: list[dict],
+    system_message: SystemMessage,
+    semaphore: asyncio.Semaphore,
+) -> dict[str, str]:
     tickets_json = json.dumps(
-        [{"id": t["classification_id"], "text": t["current_text"]} for t in tickets],
+        [{"id": t["classification_id"], "text": t["current_text"]} for t in chunk],
         ensure_ascii=False,
         indent=2,
     )
+    expected_ids = {t["classification_id"] for t in chunk}
 
     structured_llm = generator_llm.with_structured_output(ReformulationsOutput)
-    try:
-        result = await structured_llm.ainvoke([
-            SystemMessage(content=ADAPTIVE_GENERATOR_SYSTEM.format(
-                axes_and_categories=axes_text,
-                accumulated_rules=rules_text,
-            )),
-            HumanMessage(content=ADAPTIVE_GENERATOR_USER.format(
-                count=len(tickets),
-                tickets_json=tickets_json,
-            )),
-        ])
-        return [r.model_dump() for r in result.reformulations]
-    except Exception:
-        return []
+    reformulated: dict[str, str] = {}
+    for _ in range(settings.ground_truth_reformulation_retries + 1):
+        try:
+            async with semaphore:
+                result = await structured_llm.ainvoke([
+                    system_message,
+                    HumanMessage(content=ADAPTIVE_GENERATOR_USER.format(
+                        count=len(chunk),
+                        tickets_json=tickets_json,
+                    )),
+                ])
+        except Exception:
+            continue
+        for r in result.reformulations:
+            if r.id in expected_ids and r.reformulated_text.strip():
+                reformulated[r.id] = r.reformulated_text
+        if reformulated:
+            break
+    return reformulated
@@ -0,0 +1,42 @@
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from app.core.config import settings
+
+_pool: AsyncConnectionPool | None = None
+_checkpointer: AsyncPostgresSaver | None = None
+
+
+def _conninfo() -> str:
+    scheme, rest = settings.database_url.split("://", 1)
+    return f"{scheme.split('+', 1)[0]}://{rest}"
+
+
+async def open_checkpointer() -> AsyncPostgresSaver:
+    global _pool, _checkpointer
+    if _checkpointer is None:
+        _pool = AsyncConnectionPool(
+            _conninfo(),
+            max_size=settings.ground_truth_checkpoint_pool_size,
+            kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+            open=False,
+        )
+        await _pool.open()
+        _checkpointer = AsyncPostgresSaver(_pool)
+        await _checkpointer.setup()
+    return _checkpointer
+
+
+def get_checkpointer() -> AsyncPostgresSaver:
+    if _checkpointer is None:
+        raise RuntimeError("Checkpointer ground truth non initialise")
+    return _checkpointer
+
+
+async def close_checkpointer() -> None:
+    global _pool, _checkpointer
+    if _pool is not None:
+        await _pool.close()
+    _pool = None
+    _checkpointer = None
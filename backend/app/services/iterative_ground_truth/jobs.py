@@ -0,0 +1,215 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncGenerator
+from uuid import UUID, uuid4
+
+from app.core.config import settings
+from app.core.database import async_session
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class GroundTruthJob:
+    def __init__(
+        self,
+        run_id: str,
+        config_id: UUID,
+        params: dict,
+        resume: bool = False,
+        previous: "GroundTruthJob | None" = None,
+    ):
+        self.run_id = run_id
+        self.config_id = config_id
+        self.params = params
+        self.resume = resume
+        self.status: str = "queued"
+        self.attempt = uuid4().hex[:8]
+        self.attempts = {self.attempt}
+        self.events: deque[dict] = deque(maxlen=settings.ground_truth_job_max_events)
+        self.first_event_index = 0
+        if previous is not None:
+            self.events.extend(previous.events)
+            self.first_event_index = previous.first_event_index
+            self.attempts |= previous.attempts
+        self.created_at: float = time.time()
+        self.finished_at: float | None = None
+        self._changed = asyncio.Condition()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+    @property
+    def next_event_index(self) -> int:
+        return self.first_event_index + len(self.events)
+
+    def event_id(self, index: int) -> str:
+        return f"{self.attempt}:{index}"
+
+    def event_offset(self, last_event_id: str | None) -> int:
+        attempt, _, index = (last_event_id or "").partition(":")
+        if attempt not in self.attempts or not index.isdigit():
+            return 0
+        return int(index) + 1
+
+    async def publish(self, event: dict) -> None:
+        async with self._changed:
+            if len(self.events) == self.events.maxlen:
+                self.first_event_index += 1
+            self.events.append(event)
+            self._changed.notify_all()
+
+    async def finish(self, status: str) -> None:
+        async with self._changed:
+            self.status = status
+            self.finished_at = time.time()
+            self._changed.notify_all()
+
+    async def subscribe(self, offset: int = 0) -> AsyncGenerator[tuple[int, dict], None]:
+        index = offset
+        while True:
+            while index < self.next_event_index:
+                index = max(index, self.first_event_index)
+                yield index, self.events[index - self.first_event_index]
+                index += 1
+            if not self.is_active:
+                return
+            async with self._changed:
+                await self._changed.wait_for(
+                    lambda: index < self.next_event_index or not self.is_active
+                )
+
+    def get_status(self) -> dict:
+        return {
+            "run_id": self.run_id,
+            "config_id": str(self.config_id),
+            "status": self.status,
+            "resume": self.resume,
+            "event_count": self.next_event_index,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            **self.params,
+        }
+
+
+class GroundTruthJobManager:
+    def __init__(self):
+        self.jobs: dict[str, GroundTruthJob] = {}
+        self._slots: asyncio.Semaphore | None = None
+
+    def _dedup_key(self, config_id: UUID, params: dict) -> tuple:
+        return (str(config_id), tuple(sorted(params.items())))
+
+    def _purge(self) -> None:
+        cutoff = time.time() - settings.ground_truth_job_retention
+        for run_id, job in list(self.jobs.items()):
+            if job.finished_at is not None and job.finished_at < cutoff:
+                del self.jobs[run_id]
+
+    def _find_active(self, config_id: UUID, params: dict) -> GroundTruthJob | None:
+        key = self._dedup_key(config_id, params)
+        for job in self.jobs.values():
+            if job.is_active and not job.resume and self._dedup_key(job.config_id, job.params) == key:
+                return job
+        return None
+
+    def start(
+        self,
+        config_id: UUID,
+        ticket_count: int = 5,
+        max_rounds: int | None = 5,
+        target_confidence: float = 0.9,
+    ) -> tuple[GroundTruthJob, bool]:
+        self._purge()
+        params = {
+            "ticket_count": ticket_count,
+            "max_rounds": max_rounds,
+            "target_confidence": target_confidence,
+        }
+        existing = self._find_active(config_id, params)
+        if existing:
+            return existing, False
+
+        job = GroundTruthJob(str(uuid4()), config_id, params)
+        self._launch(job)
+        return job, True
+
+    def resume(self, run_id: str, config_id: UUID) -> tuple[GroundTruthJob, bool]:
+        self._purge()
+        existing = self.jobs.get(run_id)
+        if existing and existing.is_active:
+            return existing, False
+
+        job = GroundTruthJob(
+            run_id,
+            config_id,
+            existing.params if existing else {},
+            resume=True,
+            previous=existing,
+        )
+        self._launch(job)
+        return job, True
+
+    def get(self, run_id: str) -> GroundTruthJob | None:
+        return self.jobs.get(run_id)
+
+    def list_jobs(self) -> list[dict]:
+        self._purge()
+        return [job.get_status() for job in self.jobs.values()]
+
+    async def cancel(self, run_id: str) -> GroundTruthJob | None:
+        job = self.jobs.get(run_id)
+        if job and job.is_active and job._task:
+            job._task.cancel()
+        return job
+
+    async def shutdown(self) -> None:
+        tasks = [job._task for job in self.jobs.values() if job.is_active and job._task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _launch(self, job: GroundTruthJob) -> None:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(settings.ground_truth_max_jobs)
+        self.jobs[job.run_id] = job
+        job._task = asyncio.create_task(self._run(job))
+
+    async def _run(self, job: GroundTruthJob) -> None:
+        from app.services.config.config_management import get_config_with_relations
+
+        from .runner import resume_ground_truth_loop, run_ground_truth_loop
+
+        status = "done"
+        try:
+            async with self._slots:
+                job.status = "running"
+                async with async_session() as db:
+                    config = await get_config_with_relations(job.config_id, db)
+                if job.resume:
+                    events = resume_ground_truth_loop(job.run_id, config)
+                else:
+                    events = run_ground_truth_loop(config, run_id=job.run_id, **job.params)
+                async for event in events:
+                    if event["type"] == "error":
+                        status = "failed"
+                    await job.publish(event)
+        except asyncio.CancelledError:
+            status = "cancelled"
+            await job.publish({
+                "type": "error",
+                "data": {"message": "Run annule. Il peut etre repris depuis son dernier checkpoint."},
+            })
+        except Exception as exc:
+            status = "failed"
+            await job.publish({
+                "type": "error",
+                "data": {"message": f"Erreur interne : {exc}"},
+            })
+        finally:
+            await job.finish(status)
+
+
+ground_truth_job_manager = GroundTruthJobManager()
@@ -1,11 +1,18 @@
+import asyncio
 import json
 
 from langchain_core.messages import SystemMessage, HumanMessage
 
+from app.core.config import settings
 from app.core.llm import evaluator_llm
-from app.schemas.llm_outputs import JudgeOutput
+from app.schemas.llm_outputs import JudgeOutput, JudgeReduceOutput
 from app.models.config import Config
-from app.prompts.ground_truth import JUDGE_SYSTEM, JUDGE_USER
+from app.prompts.ground_truth import (
+    JUDGE_REDUCE_SYSTEM,
+    JUDGE_REDUCE_USER,
+    JUDGE_SYSTEM,
+    JUDGE_USER,
+)
 from app.services.shared.prompt_helpers import build_axes_text
 
 
@@ -23,8 +30,42 @@ async def evaluate_round(
     else:
         rules_text = "Aucune regle encore."
 
-    avg_confidence = sum(r["confidence"] for r in round_results) / len(round_results) if round_results else 0
-    above = sum(1 for r in round_results if r["confidence"] >= target_confidence)
+    size = max(1, settings.ground_truth_judge_shard_size)
+    shards = [round_results[i : i + size] for i in range(0, len(round_results), size)] or [[]]
+    semaphore = asyncio.Semaphore(settings.ground_truth_concurrency)
+
+    judgements = [
+        j
+        for j in await asyncio.gather(*(
+            _judge_shard(round_number, shard, axes_text, rules_text, target_confidence, semaphore)
+            for shard in shards
+        ))
+        if j is not None
+    ]
+    if not judgements:
+        return {
+            "ticket_evaluations": [],
+            "rules_to_add": [],
+            "rules_to_remove": [],
+            "rules_to_modify": [],
+            "global_diagnosis": "Erreur lors de l'analyse du juge.",
+        }
+    if len(shards) == 1:
+        return judgements[0]
+
+    return await _reduce_judgements(round_number, judgements, axes_text, rules_text)
+
+
+async def _judge_shard(
+    round_number: int,
+    shard: list[dict],
+    axes_text: str,
+    rules_text: str,
+    target_confidence: float,
+    semaphore: asyncio.Semaphore,
+) -> dict | None:
+    avg_confidence = sum(r["confidence"] for r in shard) / len(shard) if shard else 0
+    above = sum(1 for r in shard if r["confidence"] >= target_confidence)
 
     results_json = json.dumps(
         [
@@ -35,37 +76,103 @@ async def evaluate_round(
                 "confidence": r["confidence"],
                 "results_per_axis": r.get("results_per_axis", []),
             }
-            for r in round_results
+            for r in shard
         ],
         ensure_ascii=False,
-        indent=2,
+        separators=(",", ":"),
     )
 
     structured_llm = evaluator_llm.with_structured_output(JudgeOutput)
+    try:
+        async with semaphore:
+            result = await structured_llm.ainvoke([
+                SystemMessage(content=JUDGE_SYSTEM.format(
+                    axes_and_categories=axes_text,
+                    current_rules=rules_text,
+                )),
+                HumanMessage(content=JUDGE_USER.format(
+                    round_number=round_number,
+                    avg_confidence=avg_confidence,
+                    target_confidence=target_confidence,
+                    above_threshold=above,
+                    total_tickets=len(shard),
+                    results_json=results_json,
+                )),
+            ])
+        return result.model_dump()
+    except Exception:
+        return None
+
+
+async def _reduce_judgements(
+    round_number: int,
+    judgements: list[dict],
+    axes_text: str,
+    rules_text: str,
+) -> dict:
+    ticket_evaluations = [e for j in judgements for e in j["ticket_evaluations"]]
+
+    proposals_json = json.dumps(
+        [
+            {
+                "rules_to_add": j["rules_to_add"],
+                "rules_to_remove": j["rules_to_remove"],
+                "rules_to_modify": j["rules_to_modify"],
+                "diagnosis": j["global_diagnosis"],
+            }
+            for j in judgements
+        ],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+    structured_llm = evaluator_llm.with_structured_output(JudgeReduceOutput)
     try:
         result = await structured_llm.ainvoke([
-            SystemMessage(content=JUDGE_SYSTEM.format(
+            SystemMessage(content=JUDGE_REDUCE_SYSTEM.format(
                 axes_and_categories=axes_text,
                 current_rules=rules_text,
             )),
-            HumanMessage(content=JUDGE_USER.format(
+            HumanMessage(content=JUDGE_REDUCE_USER.format(
                 round_number=round_number,
-                avg_confidence=avg_confidence,
-                target_confidence=target_confidence,
-                above_threshold=above,
-                total_tickets=len(round_results),
-                results_json=results_json,
+                shard_count=len(judgements),
+                proposals_json=proposals_json,
             )),
         ])
-        return result.model_dump()
+        merged = result.model_dump()
     except Exception:
-        return {
-            "ticket_evaluations": [],
-            "rules_to_add": [],
-            "rules_to_remove": [],
-            "rules_to_modify": [],
-            "global_diagnosis": "Erreur lors de l'analyse du juge.",
-        }
+        merged = _merge_rule_operations(judgements)
+
+    return {"ticket_evaluations": ticket_evaluations, **merged}
+
+
+def _merge_rule_operations(judgements: list[dict]) -> dict:
+    rules_to_remove = sorted({i for j in judgements for i in j["rules_to_remove"]})
+
+    rules_to_modify: dict[int, dict] = {}
+    for j in judgements:
+        for modification in j["rules_to_modify"]:
+            idx = modification["index"]
+            if idx not in rules_to_modify and idx not in rules_to_remove:
+                rules_to_modify[idx] = modification
+
+    rules_to_add: list[str] = []
+    seen: set[str] = set()
+    for j in judgements:
+        for rule_text in j["rules_to_add"]:
+            key = rule_text.strip().lower()
+            if key and key not in seen:
+                seen.add(key)
+                rules_to_add.append(rule_text)
+
+    return {
+        "rules_to_add": rules_to_add,
+        "rules_to_remove": rules_to_remove,
+        "rules_to_modify": list(rules_to_modify.values()),
+        "global_diagnosis": " ".join(
+            j["global_diagnosis"] for j in judgements if j["global_diagnosis"]
+        ),
+    }
 
 
 def apply_rule_updates(
@@ -99,8 +206,11 @@ def apply_rule_updates(
 
     rules = [r for i, r in enumerate(rules) if i not in indices_to_remove]
 
+    existing = {r.strip().lower() for r in rules}
     for rule_text in judge_result.get("rules_to_add", []):
-        if rule_text and rule_text not in rules:
+        key = rule_text.strip().lower() if rule_text else ""
+        if key and key not in existing:
             rules.append(rule_text)
+            existing.add(key)
 
     return rules
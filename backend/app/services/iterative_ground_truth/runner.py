@@ -1,44 +1,80 @@
 import asyncio
 from collections.abc import AsyncGenerator
-from operator import add
-from typing import Annotated, Any, TypedDict
+from typing import Annotated, TypedDict
+from uuid import uuid4
 
+from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_stream_writer
 from langgraph.graph import END, StateGraph
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import async_session
+from app.core.config import settings
+from app.core.database import async_session, engine
 from app.models.classification_result import ClassificationResult
 from app.models.config import Config
 from app.models.evaluation_result import EvaluationResult
 
 from .adaptive_generator import reformulate_tickets
+from .checkpointer import get_checkpointer
 from .judge import apply_rule_updates, evaluate_round
 
 MAX_ROUNDS_SAFETY = 15
 EARLY_STOP_DELTA = 0.01
 
 
+def _merge_by_id(left: dict, right: dict) -> dict:
+    return {**left, **right}
+
+
+def _union(left: set, right: set) -> set:
+    return left | right
+
+
+def _append_trajectories(
+    left: dict[str, list[dict]], right: dict[str, list[dict]]
+) -> dict[str, list[dict]]:
+    merged = dict(left)
+    for cid, entries in right.items():
+        merged[cid] = merged.get(cid, []) + entries
+    return merged
+
+
 class GroundTruthState(TypedDict):
-    config: Any
+    config_id: str
     target_confidence: float
     max_rounds: int
-    ticket_data: list[dict]
-    frozen_ids: list[str]
-    frozen_results: dict[str, dict]
+    ticket_data: Annotated[dict[str, dict], _merge_by_id]
+    frozen_ids: Annotated[set[str], _union]
+    frozen_results: Annotated[dict[str, dict], _merge_by_id]
+    trajectories: Annotated[dict[str, list[dict]], _append_trajectories]
     accumulated_rules: list[str]
     prompt_evolution: list[dict]
     round_num: int
     prev_active_avg: float
-    all_round_results: list[list[dict]]
     reform_map: dict[str, str]
     active_results: list[dict]
-    events: Annotated[list[dict], add]
     done_data: dict | None
 
 
-async def _reformulate_node(state: GroundTruthState) -> dict:
-    config = state["config"]
+def _frozen_in_order(ticket_data: dict[str, dict], frozen_ids: set[str]) -> list[str]:
+    return [cid for cid in ticket_data if cid in frozen_ids]
+
+
+def _trajectory_entry(result: dict) -> dict:
+    return {
+        "reformulation": result["reformulated_text"][:300],
+        "confidence": result["confidence"],
+        "results_per_axis": result.get("results_per_axis", []),
+    }
+
+
+def _classification_config(config: RunnableConfig) -> Config:
+    return config["configurable"]["classification_config"]
+
+
+async def _reformulate_node(state: GroundTruthState, config: RunnableConfig) -> dict:
+    classification_config = _classification_config(config)
     ticket_data = state["ticket_data"]
     accumulated_rules = state["accumulated_rules"]
     frozen_ids = state["frozen_ids"]
@@ -46,11 +82,11 @@ async def _reformulate_node(state: GroundTruthState) -> dict:
     round_num = state["round_num"]
 
     active_tickets = [
-        td for td in ticket_data if td["classification_id"] not in frozen_ids
+        td for cid, td in ticket_data.items() if cid not in frozen_ids
     ]
-    events = []
+    write_event = get_stream_writer()
 
-    events.append({
+    write_event({
         "type": "round_start",
         "data": {
             "round": round_num,
@@ -60,9 +96,9 @@ async def _reformulate_node(state: GroundTruthState) -> dict:
         },
     })
 
-    for cid in frozen_ids:
+    for cid in _frozen_in_order(ticket_data, frozen_ids):
         fr = frozen_results[cid]
-        events.append({
+        write_event({
             "type": "ticket_result",
             "data": {
                 "round": round_num,
@@ -75,21 +111,21 @@ async def _reformulate_node(state: GroundTruthState) -> dict:
             },
         })
 
-    events.append({
+    write_event({
         "type": "phase",
         "data": {"phase": "reformulating", "status": "start", "round": round_num},
     })
 
     try:
         reformulations = await reformulate_tickets(
-            active_tickets, config, accumulated_rules
+            active_tickets, classification_config, accumulated_rules
         )
     except Exception as exc:
-        events.append({
+        write_event({
             "type": "phase",
             "data": {"phase": "reformulating", "status": "done", "round": round_num},
         })
-        events.append({
+        write_event({
             "type": "round_error",
             "data": {
                 "round": round_num,
@@ -99,30 +135,38 @@ async def _reformulate_node(state: GroundTruthState) -> dict:
         })
         reformulations = []
     else:
-        events.append({
+        write_event({
             "type": "phase",
             "data": {"phase": "reformulating", "status": "done", "round": round_num},
         })
 
     reform_map = {r["id"]: r["reformulated_text"] for r in reformulations}
-    return {"events": events, "reform_map": reform_map}
+    return {"reform_map": reform_map}
+
 
+def _classify_concurrency() -> int:
+    return max(1, min(
+        settings.ground_truth_concurrency,
+        engine.pool.size(),
+        settings.llm_max_concurrency,
+    ))
 
-async def _classify_node(state: GroundTruthState) -> dict:
-    config = state["config"]
+
+async def _classify_node(state: GroundTruthState, config: RunnableConfig) -> dict:
+    classification_config = _classification_config(config)
     ticket_data = state["ticket_data"]
     frozen_ids = state["frozen_ids"]
     frozen_results = state["frozen_results"]
     reform_map = state["reform_map"]
     round_num = state["round_num"]
+    write_event = get_stream_writer()
 
     active_tickets = [
-        td for td in ticket_data if td["classification_id"] not in frozen_ids
+        td for cid, td in ticket_data.items() if cid not in frozen_ids
     ]
-    events = []
 
     total = len(active_tickets)
-    events.append({
+    write_event({
         "type": "phase",
         "data": {
             "phase": "classifying",
@@ -132,6 +176,8 @@ async def _classify_node(state: GroundTruthState) -> dict:
         },
     })
 
+    semaphore = asyncio.Semaphore(_classify_concurrency())
+
     async def _classify_one(td: dict) -> dict:
         cid = td["classification_id"]
         reformulated_text = reform_map.get(cid)
@@ -139,13 +185,13 @@ async def _classify_node(state: GroundTruthState) -> dict:
         if used_fallback:
             reformulated_text = td["current_text"]
         try:
-            async with async_session() as classify_db:
+            async with semaphore, async_session() as classify_db:
                 from app.services.classification.classification_pipeline import (
                     classify_ticket,
                 )
 
                 classification = await classify_ticket(
-                    reformulated_text, config, classify_db
+                    reformulated_text, classification_config, classify_db, persist=False
                 )
             results_per_axis = [
                 {
@@ -155,7 +201,6 @@ async def _classify_node(state: GroundTruthState) -> dict:
                 }
                 for r in (classification.results or [])
             ]
-            td["current_text"] = reformulated_text
             return {
                 "classification_id": cid,
                 "original_text": td["original_text"],
@@ -176,14 +221,13 @@ async def _classify_node(state: GroundTruthState) -> dict:
                 "error": str(exc),
             }
 
-    active_results = list(
-        await asyncio.gather(*[_classify_one(td) for td in active_tickets])
-    )
-
-    for result in active_results:
+    results_by_id: dict[str, dict] = {}
+    for finished in asyncio.as_completed([_classify_one(td) for td in active_tickets]):
+        result = await finished
         cid = result["classification_id"]
+        results_by_id[cid] = result
         if result["error"]:
-            events.append({
+            write_event({
                 "type": "ticket_error",
                 "data": {
                     "round": round_num,
@@ -192,7 +236,7 @@ async def _classify_node(state: GroundTruthState) -> dict:
                 },
             })
         else:
-            events.append({
+            write_event({
                 "type": "ticket_result",
                 "data": {
                     "round": round_num,
@@ -202,36 +246,43 @@ async def _classify_node(state: GroundTruthState) -> dict:
                     "results_per_axis": result["results_per_axis"],
                     "used_fallback": result["used_fallback"],
                     "frozen": False,
+                    "detail": f"{len(results_by_id)}/{total}",
                 },
             })
 
-    events.append({
+    write_event({
         "type": "phase",
         "data": {"phase": "classifying", "status": "done", "round": round_num},
     })
 
-    round_results = active_results + [frozen_results[cid] for cid in frozen_ids]
-    all_round_results = state["all_round_results"] + [round_results]
+    active_results = [results_by_id[td["classification_id"]] for td in active_tickets]
+    trajectories = {
+        cid: [_trajectory_entry(results_by_id.get(cid) or frozen_results[cid])]
+        for cid in ticket_data
+    }
+    updated_tickets = {
+        cid: {**ticket_data[cid], "current_text": result["reformulated_text"]}
+        for cid, result in results_by_id.items()
+        if not result["error"]
+    }
 
     return {
-        "events": events,
-        "all_round_results": all_round_results,
+        "ticket_data": updated_tickets,
+        "trajectories": trajectories,
         "active_results": active_results,
     }
 
 
-async def _evaluate_node(state: GroundTruthState) -> dict:
-    config = state["config"]
+async def _evaluate_node(state: GroundTruthState, config: RunnableConfig) -> dict:
+    classification_config = _classification_config(config)
     round_num = state["round_num"]
     active_results = state["active_results"]
     target_confidence = state["target_confidence"]
     accumulated_rules = state["accumulated_rules"]
-    frozen_ids = list(state["frozen_ids"])
-    frozen_results = dict(state["frozen_results"])
+    frozen_ids = state["frozen_ids"]
+    frozen_results = state["frozen_results"]
 
-    all_results = active_results + [
-        frozen_results[cid] for cid in state["frozen_ids"]
-    ]
+    all_results = active_results + [frozen_results[cid] for cid in frozen_ids]
     avg_confidence = sum(r["confidence"] for r in all_results) / len(all_results)
     active_avg = (
         sum(r["confidence"] for r in active_results) / len(active_results)
@@ -242,8 +293,8 @@ async def _evaluate_node(state: GroundTruthState) -> dict:
         1 for r in all_results if r["confidence"] >= target_confidence
     )
 
-    events = []
-    events.append({
+    write_event = get_stream_writer()
+    write_event({
         "type": "phase",
         "data": {"phase": "evaluating", "status": "start", "round": round_num},
     })
@@ -252,16 +303,16 @@ async def _evaluate_node(state: GroundTruthState) -> dict:
         judge_result = await evaluate_round(
             round_number=round_num,
             round_results=list(active_results),
-            config=config,
+            config=classification_config,
             current_rules=accumulated_rules,
             target_confidence=target_confidence,
         )
     except Exception as exc:
-        events.append({
+        write_event({
             "type": "phase",
             "data": {"phase": "evaluating", "status": "done", "round": round_num},
         })
-        events.append({
+        write_event({
             "type": "round_error",
             "data": {"round": round_num, "phase": "evaluating", "error": str(exc)},
         })
@@ -273,7 +324,7 @@ async def _evaluate_node(state: GroundTruthState) -> dict:
             "global_diagnosis": f"Le juge a echoue ce round : {exc}",
         }
     else:
-        events.append({
+        write_event({
             "type": "phase",
             "data": {"phase": "evaluating", "status": "done", "round": round_num},
         })
@@ -287,21 +338,22 @@ async def _evaluate_node(state: GroundTruthState) -> dict:
         "rules_modified": judge_result.get("rules_to_modify", []),
     }]
 
-    for result in active_results:
-        if not result["error"] and result["confidence"] >= target_confidence:
-            cid = result["classification_id"]
-            if cid not in frozen_ids:
-                frozen_ids.append(cid)
-                frozen_results[cid] = result
+    newly_frozen = {
+        result["classification_id"]: result
+        for result in active_results
+        if not result["error"]
+        and result["confidence"] >= target_confidence
+        and result["classification_id"] not in frozen_ids
+    }
 
-    events.append({
+    write_event({
         "type": "round_complete",
         "data": {
             "round": round_num,
             "avg_confidence": round(avg_confidence, 3),
             "above_threshold": above_threshold,
             "total_tickets": len(all_results),
-            "frozen_tickets": len(frozen_ids),
+            "frozen_tickets": len(frozen_ids) + len(newly_frozen),
             "rules_added": judge_result.get("rules_to_add", []),
             "rules_removed": judge_result.get("rules_to_remove", []),
             "rules_modified": judge_result.get("rules_to_modify", []),
@@ -336,11 +388,10 @@ async def _evaluate_node(state: GroundTruthState) -> dict:
         }
 
     return {
-        "events": events,
         "accumulated_rules": new_rules,
         "prompt_evolution": prompt_evolution,
-        "frozen_ids": frozen_ids,
-        "frozen_results": frozen_results,
+        "frozen_ids": set(newly_frozen),
+        "frozen_results": newly_frozen,
         "round_num": round_num + 1,
         "prev_active_avg": active_avg,
         "done_data": done_data,
@@ -349,30 +400,89 @@ async def _evaluate_node(state: GroundTruthState) -> dict:
 
 def _should_continue(state: GroundTruthState) -> str:
     if state["done_data"]:
-        return END
-    active = [
-        td
-        for td in state["ticket_data"]
-        if td["classification_id"] not in state["frozen_ids"]
-    ]
-    if not active:
-        return END
+        return "finalize"
+    if len(state["frozen_ids"]) >= len(state["ticket_data"]):
+        return "finalize"
     if state["round_num"] > state["max_rounds"]:
-        return END
+        return "finalize"
     return "reformulate"
 
 
+async def _finalize_node(state: GroundTruthState) -> dict:
+    ticket_data = state["ticket_data"]
+    done_data = state["done_data"]
+    if not done_data:
+        frozen_count = len(state["frozen_ids"])
+        total = len(ticket_data)
+        last_round = state["round_num"] - 1
+
+        if frozen_count > 0:
+            final_avg = (
+                sum(
+                    state["frozen_results"][cid]["confidence"]
+                    for cid in state["frozen_ids"]
+                )
+                / total
+            )
+        else:
+            final_avg = state["prev_active_avg"]
+
+        done_data = {
+            "reason": "all_frozen" if frozen_count == total else "max_rounds",
+            "rounds_completed": last_round,
+            "final_avg_confidence": round(final_avg, 3),
+            "message": (
+                f"Tous les tickets ont atteint le seuil en {last_round} round(s)."
+                if frozen_count == total
+                else f"Maximum de {state['max_rounds']} rounds atteint."
+            ),
+        }
+
+    get_stream_writer()({"type": "done", "data": done_data})
+
+    async with async_session() as db:
+        await _persist_results(
+            state["config_id"],
+            db,
+            state["max_rounds"],
+            state["target_confidence"],
+            ticket_data,
+            state["trajectories"],
+            state["accumulated_rules"],
+            state["prompt_evolution"],
+            done_data,
+        )
+
+    return {"done_data": done_data}
+
+
 _graph_builder = StateGraph(GroundTruthState)
 _graph_builder.add_node("reformulate", _reformulate_node)
 _graph_builder.add_node("classify", _classify_node)
 _graph_builder.add_node("evaluate", _evaluate_node)
+_graph_builder.add_node("finalize", _finalize_node)
 _graph_builder.add_edge("reformulate", "classify")
 _graph_builder.add_edge("classify", "evaluate")
 _graph_builder.add_conditional_edges(
-    "evaluate", _should_continue, {"reformulate": "reformulate", END: END}
+    "evaluate",
+    _should_continue,
+    {"reformulate": "reformulate", "finalize": "finalize"},
 )
+_graph_builder.add_edge("finalize", END)
 _graph_builder.set_entry_point("reformulate")
-ground_truth_graph = _graph_builder.compile()
+
+_ground_truth_graph = None
+
+
+def get_ground_truth_graph():
+    global _ground_truth_graph
+    if _ground_truth_graph is None:
+        _ground_truth_graph = _graph_builder.compile(checkpointer=get_checkpointer())
+    return _ground_truth_graph
+
+
+def _run_config(run_id: str, config: Config) -> RunnableConfig:
+    return {"configurable": {"thread_id": run_id, "classification_config": config}}
 
 
 async def _select_low_confidence_tickets(
@@ -389,14 +499,15 @@ async def _select_low_confidence_tickets(
 
 async def run_ground_truth_loop(
     config: Config,
-    db: AsyncSession,
     ticket_count: int = 5,
     max_rounds: int | None = 5,
     target_confidence: float = 0.9,
+    run_id: str | None = None,
 ) -> AsyncGenerator[dict, None]:
     effective_max = max_rounds or MAX_ROUNDS_SAFETY
 
-    tickets = await _select_low_confidence_tickets(config.id, db, ticket_count)
+    async with async_session() as db:
+        tickets = await _select_low_confidence_tickets(config.id, db, ticket_count)
     if not tickets:
         yield {
             "type": "error",
@@ -404,19 +515,21 @@ async def run_ground_truth_loop(
         }
         return
 
-    ticket_data = [
-        {
+    ticket_data = {
+        str(t.id): {
             "classification_id": str(t.id),
             "original_text": t.input_text,
             "current_text": t.input_text,
             "original_confidence": t.overall_confidence,
         }
         for t in tickets
-    ]
+    }
+    run_id = run_id or str(uuid4())
 
     yield {
         "type": "init",
         "data": {
+            "run_id": run_id,
             "ticket_count": len(ticket_data),
             "max_rounds": effective_max,
             "target_confidence": target_confidence,
@@ -426,109 +539,98 @@ async def run_ground_truth_loop(
                     "original_text": td["original_text"][:100],
                     "original_confidence": td["original_confidence"],
                 }
-                for td in ticket_data
+                for td in ticket_data.values()
             ],
         },
     }
 
     initial_state: GroundTruthState = {
-        "config": config,
+        "config_id": str(config.id),
         "target_confidence": target_confidence,
         "max_rounds": effective_max,
         "ticket_data": ticket_data,
-        "frozen_ids": [],
+        "frozen_ids": set(),
         "frozen_results": {},
+        "trajectories": {},
         "accumulated_rules": [],
         "prompt_evolution": [],
         "round_num": 1,
         "prev_active_avg": 0.0,
-        "all_round_results": [],
         "reform_map": {},
         "active_results": [],
-        "events": [],
         "done_data": None,
     }
 
-    events_yielded = 0
-    final_state = initial_state
+    async for event in _stream_run(initial_state, _run_config(run_id, config)):
+        yield event
 
-    async for state_snapshot in ground_truth_graph.astream(
-        initial_state, stream_mode="values"
-    ):
-        new_events = state_snapshot["events"][events_yielded:]
-        for event in new_events:
-            yield event
-        events_yielded = len(state_snapshot["events"])
-        final_state = state_snapshot
 
-    done_data = final_state.get("done_data")
-    if not done_data:
-        frozen_count = len(final_state["frozen_ids"])
-        total = len(ticket_data)
-        last_round = final_state["round_num"] - 1
+async def get_ground_truth_run(run_id: str) -> dict | None:
+    snapshot = await get_ground_truth_graph().aget_state(
+        {"configurable": {"thread_id": run_id}}
+    )
+    if not snapshot.values:
+        return None
+    state = snapshot.values
+    return {
+        "run_id": run_id,
+        "config_id": state["config_id"],
+        "status": "running" if snapshot.next else "done",
+        "next": list(snapshot.next),
+        "round_num": state["round_num"],
+        "max_rounds": state["max_rounds"],
+        "target_confidence": state["target_confidence"],
+        "ticket_count": len(state["ticket_data"]),
+        "frozen_tickets": len(state["frozen_ids"]),
+        "accumulated_rules": state["accumulated_rules"],
+        "done": state["done_data"] if not snapshot.next else None,
+        "updated_at": snapshot.created_at,
+    }
 
-        if frozen_count > 0:
-            final_avg = (
-                sum(
-                    final_state["frozen_results"][cid]["confidence"]
-                    for cid in final_state["frozen_ids"]
-                )
-                / total
-            )
-        else:
-            final_avg = final_state["prev_active_avg"]
 
-        done_data = {
-            "reason": "all_frozen" if frozen_count == total else "max_rounds",
-            "rounds_completed": last_round,
-            "final_avg_confidence": round(final_avg, 3),
-            "message": (
-                f"Tous les tickets ont atteint le seuil en {last_round} round(s)."
-                if frozen_count == total
-                else f"Maximum de {effective_max} rounds atteint."
-            ),
-        }
+async def resume_ground_truth_loop(
+    run_id: str, config: Config
+) -> AsyncGenerator[dict, None]:
+    run_config = _run_config(run_id, config)
+    snapshot = await get_ground_truth_graph().aget_state(run_config)
+    state = snapshot.values
 
-    yield {"type": "done", "data": done_data}
-
-    await _persist_results(
-        config,
-        db,
-        effective_max,
-        target_confidence,
-        ticket_data,
-        final_state["all_round_results"],
-        final_state["accumulated_rules"],
-        final_state["prompt_evolution"],
-        done_data,
-    )
+    yield {
+        "type": "resumed",
+        "data": {
+            "run_id": run_id,
+            "round": state["round_num"],
+            "next": list(snapshot.next),
+            "frozen_tickets": len(state["frozen_ids"]),
+            "accumulated_rules": state["accumulated_rules"],
+        },
+    }
 
+    async for event in _stream_run(None, run_config):
+        yield event
 
-async def _persist_results(
-    config: Config,
-    db: AsyncSession,
-    max_rounds: int,
+
+async def _stream_run(
+    graph_input: GroundTruthState | None,
+    run_config: RunnableConfig,
+) -> AsyncGenerator[dict, None]:
+    async for event in get_ground_truth_graph().astream(
+        graph_input,
+        run_config,
+        stream_mode="custom",
+        durability="sync",
+    ):
+        yield event
+
+
+def _build_trajectories(
+    ticket_data: dict[str, dict],
+    trajectories: dict[str, list[dict]],
     target_confidence: float,
-    ticket_data: list[dict],
-    all_round_results: list[list[dict]],
-    accumulated_rules: list[str],
-    prompt_evolution: list[dict],
-    done_data: dict,
-) -> None:
+) -> list[dict]:
     ticket_trajectories = []
-    for td in ticket_data:
-        cid = td["classification_id"]
-        rounds = []
-        for round_results in all_round_results:
-            for rr in round_results:
-                if rr["classification_id"] == cid:
-                    rounds.append({
-                        "reformulation": rr["reformulated_text"][:300],
-                        "confidence": rr["confidence"],
-                        "results_per_axis": rr.get("results_per_axis", []),
-                    })
-                    break
-
+    for cid, td in ticket_data.items():
+        rounds = trajectories.get(cid, [])
         ticket_trajectories.append({
             "classification_id": cid,
             "original_text": td["original_text"][:300],
@@ -541,9 +643,26 @@ async def _persist_results(
             ),
             "rounds": rounds,
         })
+    return ticket_trajectories
+
+
+async def _persist_results(
+    config_id: str,
+    db: AsyncSession,
+    max_rounds: int,
+    target_confidence: float,
+    ticket_data: dict[str, dict],
+    trajectories: dict[str, list[dict]],
+    accumulated_rules: list[str],
+    prompt_evolution: list[dict],
+    done_data: dict,
+) -> None:
+    ticket_trajectories = _build_trajectories(
+        ticket_data, trajectories, target_confidence
+    )
 
     evaluation = EvaluationResult(
-        config_id=config.id,
+        config_id=config_id,
         eval_type="ground_truth",
         results={
             "max_rounds": max_rounds,
@@ -1,18 +1,20 @@
 import json
 from uuid import UUID
 
-from sqlalchemy import select, func, and_
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from langchain_core.messages import SystemMessage, HumanMessage
 
 from app.core.llm import classifier_llm
-from app.models.axis import Axis
-from app.models.axis_category import AxisCategory
 from app.models.classification_result import ClassificationResult
 from app.models.user_feedback import UserFeedback
 from app.prompts.feedback_parser import FEEDBACK_PARSER_SYSTEM_PROMPT
 from app.schemas.llm_outputs import FeedbackParserOutput
+from app.services.learning.review_queue import (
+    refresh_after_feedback,
+    remove_from_review_queue,
+)
 from app.services.shared.prompt_helpers import build_axes_text
 
 
@@ -23,12 +25,13 @@ async def store_feedback(
     reasoning_feedback: str | None,
     feedback_type: str,
     db: AsyncSession,
+    refresh_queue: bool = True,
 ) -> UserFeedback:
     review_status = "non_reviewed"
     original_category_id = None
+    classification = await db.get(ClassificationResult, classification_id)
 
     if corrected_category_id is not None:
-        classification = await db.get(ClassificationResult, classification_id)
         if classification and classification.results:
             for r in classification.results:
                 if r.get("axis_id") == str(axis_id):
@@ -56,6 +59,12 @@ async def store_feedback(
         active=True,
     )
     db.add(feedback)
+    await remove_from_review_queue(classification_id, db)
+    await db.flush()
+    if classification is not None and refresh_queue:
+        await refresh_after_feedback(
+            classification.config_id, corrected_category_id, db
+        )
     await db.commit()
     await db.refresh(feedback)
 
@@ -130,129 +139,3 @@ async def process_natural_feedback(
         "feedback_id": str(feedback.id),
         "learning_card": learning_card,
     }
-
-
-def _compute_priority_score(
-    classification: ClassificationResult,
-    is_early: bool,
-    cat_fb_counts: dict[tuple[str, str], int],
-) -> float:
-    confidence_score = 1.0 - classification.overall_confidence
-
-    challenged_score = 1.0 if classification.was_challenged else 0.0
-
-    disagreement_score = 0.0
-    if classification.vote_details and "results_per_axis" in classification.vote_details:
-        non_unanimous = sum(
-            1 for r in classification.vote_details["results_per_axis"]
-            if r.get("empirical_confidence", 1.0) < 1.0
-        )
-        total_axes = len(classification.vote_details["results_per_axis"])
-        if total_axes > 0:
-            disagreement_score = non_unanimous / total_axes
-
-    rarity_score = 0.0
-    if classification.results:
-        rarity_scores = []
-        for r in classification.results:
-            key = (r.get("axis_name", ""), r.get("category_name", ""))
-            count = cat_fb_counts.get(key, 0)
-            rarity_scores.append(1.0 / (1.0 + count))
-        if rarity_scores:
-            rarity_score = sum(rarity_scores) / len(rarity_scores)
-
-    diversity_score = 0.5
-
-    if is_early:
-        score = (
-            rarity_score * 0.35
-            + confidence_score * 0.25
-            + challenged_score * 0.20
-            + disagreement_score * 0.15
-            + diversity_score * 0.05
-        )
-    else:
-        score = (
-            disagreement_score * 0.30
-            + confidence_score * 0.25
-            + rarity_score * 0.20
-            + challenged_score * 0.15
-            + diversity_score * 0.10
-        )
-
-    return round(min(1.0, max(0.0, score)), 3)
-
-
-async def get_priority_queue(
-    config_id: UUID, db: AsyncSession, limit: int = 10
-) -> list[dict]:
-    pending_query = (
-        select(ClassificationResult)
-        .outerjoin(UserFeedback, UserFeedback.classification_id == ClassificationResult.id)
-        .where(
-            and_(
-                ClassificationResult.config_id == config_id,
-                UserFeedback.id.is_(None),
-            )
-        )
-        .order_by(ClassificationResult.overall_confidence.asc())
-        .limit(limit * 3)
-    )
-    result = await db.execute(pending_query)
-    candidates = list(result.scalars().unique().all())
-
-    if not candidates:
-        return []
-
-    total_fb_result = await db.execute(
-        select(func.count())
-        .select_from(UserFeedback)
-        .join(ClassificationResult, UserFeedback.classification_id == ClassificationResult.id)
-        .where(
-            and_(
-                ClassificationResult.config_id == config_id,
-                UserFeedback.active == True,
-            )
-        )
-    )
-    fb_count = total_fb_result.scalar() or 0
-    is_early = fb_count < 30
-
-    cat_counts_result = await db.execute(
-        select(
-            Axis.name.label("axis_name"),
-            AxisCategory.name.label("cat_name"),
-            func.count().label("cnt"),
-        )
-        .select_from(UserFeedback)
-        .join(AxisCategory, UserFeedback.corrected_category_id == AxisCategory.id)
-        .join(Axis, UserFeedback.axis_id == Axis.id)
-        .where(UserFeedback.active == True)
-        .group_by(Axis.name, AxisCategory.name)
-    )
-    cat_fb_counts = {
-        (r.axis_name, r.cat_name): r.cnt
-        for r in cat_counts_result.fetchall()
-    }
-
-    scored = []
-    for c in candidates:
-        score = _compute_priority_score(c, is_early, cat_fb_counts)
-
-        reasons = []
-        if c.overall_confidence < 0.75:
-            reasons.append(f"Confiance faible ({int(c.overall_confidence * 100)}%)")
-        if c.was_challenged:
-            reasons.append("Challenger active")
-
-        scored.append({
-            "classification_id": str(c.id),
-            "text_preview": c.input_text[:120] + ("..." if len(c.input_text) > 120 else ""),
-            "priority_score": score,
-            "reason": " + ".join(reasons) if reasons else "Score composite eleve",
-            "current_classification": c.results,
-            "challenger_opinion": c.challenger_response,
-        })
-
-    scored.sort(key=lambda x: x["priority_score"], reverse=True)
-    return scored[:limit]
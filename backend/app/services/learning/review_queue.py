@@ -0,0 +1,301 @@
+import json
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import delete, func, or_, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.axis import Axis
+from app.models.axis_category import AxisCategory
+from app.models.classification_result import ClassificationResult
+from app.models.review_queue_item import ReviewQueueItem
+from app.models.user_feedback import UserFeedback
+
+PRIORITY_EARLY_FEEDBACK_THRESHOLD = 30
+PRIORITY_DIVERSITY_SCORE = 0.5
+
+PRIORITY_WEIGHTS_EARLY = {
+    "rarity": 0.35,
+    "confidence": 0.25,
+    "challenged": 0.20,
+    "disagreement": 0.15,
+    "diversity": 0.05,
+}
+
+PRIORITY_WEIGHTS_MATURE = {
+    "disagreement": 0.30,
+    "confidence": 0.25,
+    "rarity": 0.20,
+    "challenged": 0.15,
+    "diversity": 0.10,
+}
+
+_SCOPE_ALL = ""
+_SCOPE_IDS = "AND cr.id = ANY(CAST(:classification_ids AS uuid[]))"
+_SCOPE_CATEGORY = "AND cr.results @> CAST(:category_filter AS jsonb)"
+
+_REFRESH_SQL = """
+    WITH feedback_total AS (
+        SELECT count(*) AS n
+        FROM user_feedbacks uf
+        JOIN classification_results cr ON cr.id = uf.classification_id
+        WHERE cr.config_id = :config_id
+            AND uf.active = true
+    ),
+    category_feedbacks AS (
+        SELECT ax.name AS axis_name, ac.name AS category_name, count(*) AS cnt
+        FROM user_feedbacks uf
+        JOIN axes ax ON ax.id = uf.axis_id
+        JOIN axes_categories ac ON ac.id = uf.corrected_category_id
+        WHERE ax.config_id = :config_id
+            AND uf.active = true
+        GROUP BY ax.name, ac.name
+    ),
+    pool AS (
+        SELECT
+            cr.id,
+            cr.config_id,
+            1.0 - cr.overall_confidence AS confidence_score,
+            CASE WHEN cr.was_challenged THEN 1.0 ELSE 0.0 END AS challenged_score,
+            COALESCE((
+                SELECT avg(CASE
+                    WHEN COALESCE((v ->> 'empirical_confidence')::float, 1.0) < 1.0
+                    THEN 1.0 ELSE 0.0 END)
+                FROM jsonb_array_elements(
+                    CASE WHEN jsonb_typeof(cr.vote_details -> 'results_per_axis') = 'array'
+                    THEN cr.vote_details -> 'results_per_axis' ELSE '[]'::jsonb END
+                ) v
+            ), 0.0) AS disagreement_score,
+            COALESCE((
+                SELECT avg(1.0 / (1 + COALESCE(cf.cnt, 0)))
+                FROM jsonb_array_elements(
+                    CASE WHEN jsonb_typeof(cr.results) = 'array'
+                    THEN cr.results ELSE '[]'::jsonb END
+                ) r
+                LEFT JOIN category_feedbacks cf
+                    ON cf.axis_name = COALESCE(r ->> 'axis_name', '')
+                    AND cf.category_name = COALESCE(r ->> 'category_name', '')
+            ), 0.0) AS rarity_score
+        FROM classification_results cr
+        WHERE cr.config_id = :config_id
+            AND NOT EXISTS (
+                SELECT 1 FROM user_feedbacks uf WHERE uf.classification_id = cr.id
+            )
+            {scope}
+    ),
+    scored AS (
+        SELECT
+            pool.id,
+            pool.config_id,
+            round(LEAST(1.0, GREATEST(0.0, CASE
+                WHEN feedback_total.n < :early_threshold THEN
+                    rarity_score * CAST(:early_rarity AS float)
+                    + confidence_score * CAST(:early_confidence AS float)
+                    + challenged_score * CAST(:early_challenged AS float)
+                    + disagreement_score * CAST(:early_disagreement AS float)
+                    + CAST(:early_diversity AS float)
+                ELSE
+                    disagreement_score * CAST(:mature_disagreement AS float)
+                    + confidence_score * CAST(:mature_confidence AS float)
+                    + rarity_score * CAST(:mature_rarity AS float)
+                    + challenged_score * CAST(:mature_challenged AS float)
+                    + CAST(:mature_diversity AS float)
+            END))::numeric, 3)::float AS priority_score
+        FROM pool, feedback_total
+    )
+    INSERT INTO review_queue_items (classification_id, config_id, priority_score, updated_at)
+    SELECT id, config_id, priority_score, now()
+    FROM scored
+    ON CONFLICT (classification_id) DO UPDATE
+    SET priority_score = EXCLUDED.priority_score,
+        updated_at = EXCLUDED.updated_at
+"""
+
+
+def _scoring_params(config_id: UUID) -> dict:
+    params = {
+        "config_id": str(config_id),
+        "early_threshold": PRIORITY_EARLY_FEEDBACK_THRESHOLD,
+    }
+    for phase, weights in (
+        ("early", PRIORITY_WEIGHTS_EARLY),
+        ("mature", PRIORITY_WEIGHTS_MATURE),
+    ):
+        params.update({f"{phase}_{k}": w for k, w in weights.items()})
+        params[f"{phase}_diversity"] = weights["diversity"] * PRIORITY_DIVERSITY_SCORE
+    return params
+
+
+async def refresh_review_queue(
+    config_id: UUID,
+    db: AsyncSession,
+    classification_ids: list[UUID] | None = None,
+    category: tuple[str, str] | None = None,
+) -> None:
+    params = _scoring_params(config_id)
+    if classification_ids is not None:
+        scope = _SCOPE_IDS
+        params["classification_ids"] = [str(cid) for cid in classification_ids]
+    elif category is not None:
+        scope = _SCOPE_CATEGORY
+        params["category_filter"] = json.dumps(
+            [{"axis_name": category[0], "category_name": category[1]}]
+        )
+    else:
+        scope = _SCOPE_ALL
+
+    await db.execute(text(_REFRESH_SQL.format(scope=scope)), params)
+
+
+async def refresh_after_feedback(
+    config_id: UUID, corrected_category_id: UUID | None, db: AsyncSession
+) -> None:
+    feedback_total = await db.scalar(
+        select(func.count())
+        .select_from(UserFeedback)
+        .join(ClassificationResult, UserFeedback.classification_id == ClassificationResult.id)
+        .where(
+            ClassificationResult.config_id == config_id,
+            UserFeedback.active.is_(True),
+        )
+    )
+    if feedback_total == PRIORITY_EARLY_FEEDBACK_THRESHOLD:
+        await refresh_review_queue(config_id, db)
+        return
+
+    if corrected_category_id is None:
+        return
+    names = (await db.execute(
+        select(Axis.name, AxisCategory.name)
+        .join(AxisCategory, AxisCategory.axis_id == Axis.id)
+        .where(AxisCategory.id == corrected_category_id)
+    )).first()
+    if names is not None:
+        await refresh_review_queue(config_id, db, category=(names[0], names[1]))
+
+
+async def remove_from_review_queue(classification_id: UUID, db: AsyncSession) -> None:
+    await db.execute(
+        delete(ReviewQueueItem).where(ReviewQueueItem.classification_id == classification_id)
+    )
+
+
+def _build_reason(classification: ClassificationResult) -> str:
+    reasons = []
+    if classification.overall_confidence < 0.75:
+        reasons.append(f"Confiance faible ({int(classification.overall_confidence * 100)}%)")
+    if classification.was_challenged:
+        reasons.append("Challenger active")
+    vote_details = classification.vote_details or {}
+    if any(
+        r.get("empirical_confidence", 1.0) < 1.0
+        for r in vote_details.get("results_per_axis", [])
+    ):
+        reasons.append("Desaccord entre votes")
+    return " + ".join(reasons) if reasons else "Score composite eleve"
+
+
+def _format_item(item: ReviewQueueItem, classification: ClassificationResult) -> dict:
+    return {
+        "classification_id": str(classification.id),
+        "text_preview": classification.input_text[:120] + (
+            "..." if len(classification.input_text) > 120 else ""
+        ),
+        "priority_score": item.priority_score,
+        "reason": _build_reason(classification),
+        "current_classification": classification.results,
+        "challenger_opinion": classification.challenger_response,
+        "claimed_by": item.claimed_by,
+        "lease_expires_at": (
+            item.lease_expires_at.isoformat() if item.lease_expires_at else None
+        ),
+    }
+
+
+def _available():
+    return or_(
+        ReviewQueueItem.lease_expires_at.is_(None),
+        ReviewQueueItem.lease_expires_at < func.now(),
+    )
+
+
+async def get_priority_queue(
+    config_id: UUID, db: AsyncSession, limit: int = 10
+) -> list[dict]:
+    result = await db.execute(
+        select(ReviewQueueItem, ClassificationResult)
+        .join(
+            ClassificationResult,
+            ClassificationResult.id == ReviewQueueItem.classification_id,
+        )
+        .where(ReviewQueueItem.config_id == config_id, _available())
+        .order_by(ReviewQueueItem.priority_score.desc())
+        .limit(limit)
+    )
+    return [_format_item(item, classification) for item, classification in result.all()]
+
+
+async def claim_review_items(
+    config_id: UUID,
+    reviewer: str,
+    db: AsyncSession,
+    count: int = 1,
+    lease_seconds: int | None = None,
+) -> list[dict]:
+    lease = timedelta(seconds=lease_seconds or settings.review_lease_seconds)
+
+    result = await db.execute(
+        select(ReviewQueueItem)
+        .where(ReviewQueueItem.config_id == config_id, _available())
+        .order_by(ReviewQueueItem.priority_score.desc())
+        .limit(count)
+        .with_for_update(skip_locked=True)
+    )
+    items = list(result.scalars().all())
+
+    expires_at = datetime.now(timezone.utc) + lease
+    for item in items:
+        item.claimed_by = reviewer
+        item.lease_expires_at = expires_at
+    await db.commit()
+
+    if not items:
+        return []
+
+    classifications = await db.execute(
+        select(ClassificationResult).where(
+            ClassificationResult.id.in_([item.classification_id for item in items])
+        )
+    )
+    by_id = {c.id: c for c in classifications.scalars().all()}
+    return [
+        _format_item(item, by_id[item.classification_id])
+        for item in items
+        if item.classification_id in by_id
+    ]
+
+
+async def release_review_item(
+    classification_id: UUID, reviewer: str, db: AsyncSession
+) -> bool:
+    item = await db.get(ReviewQueueItem, classification_id, with_for_update=True)
+    if item is None or item.claimed_by != reviewer:
+        return False
+    item.claimed_by = None
+    item.lease_expires_at = None
+    await db.commit()
+    return True
+
+
+async def release_reviewer_items(
+    config_id: UUID, reviewer: str, db: AsyncSession
+) -> None:
+    await db.execute(
+        update(ReviewQueueItem)
+        .where(
+            ReviewQueueItem.config_id == config_id,
+            ReviewQueueItem.claimed_by == reviewer,
+        )
+        .values(claimed_by=None, lease_expires_at=None)
+    )
@@ -0,0 +1,12 @@
+from sqlalchemy import or_
+
+from app.models.classification_result import ClassificationResult
+
+
+def category_condition(axis_name: str, categories: list[str]):
+    return or_(*(
+        ClassificationResult.results.contains(
+            [{"axis_name": axis_name, "category_name": category}]
+        )
+        for category in categories
+    ))
@@ -0,0 +1,86 @@
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.classification_result import ClassificationResult
+
+SEARCH_CONFIG = "french"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+
+def ticket_search_query(term: str):
+    return func.websearch_to_tsquery(SEARCH_CONFIG, term)
+
+
+def matches_search(term: str):
+    return ClassificationResult.search_vector.op("@@")(ticket_search_query(term))
+
+
+def search_rank(term: str):
+    return func.ts_rank_cd(ClassificationResult.search_vector, ticket_search_query(term))
+
+
+def search_headline(term: str):
+    return func.ts_headline(
+        SEARCH_CONFIG,
+        ClassificationResult.input_text,
+        ticket_search_query(term),
+        HEADLINE_OPTIONS,
+    )
+
+
+async def search_classifications(
+    config_id: UUID,
+    term: str,
+    db: AsyncSession,
+    limit: int = 20,
+    offset: int = 0,
+) -> dict:
+    base_filter = (ClassificationResult.config_id == config_id, matches_search(term))
+
+    total = (
+        await db.execute(
+            select(func.count()).select_from(ClassificationResult).where(*base_filter)
+        )
+    ).scalar() or 0
+
+    ranked = (
+        select(
+            ClassificationResult.id,
+            ClassificationResult.input_text,
+            ClassificationResult.results,
+            ClassificationResult.overall_confidence,
+            ClassificationResult.created_at,
+            search_rank(term).label("rank"),
+        )
+        .where(*base_filter)
+        .order_by(search_rank(term).desc(), ClassificationResult.created_at.desc())
+        .limit(limit)
+        .offset(offset)
+        .subquery()
+    )
+    result = await db.execute(
+        select(
+            ranked,
+            func.ts_headline(
+                SEARCH_CONFIG, ranked.c.input_text, ticket_search_query(term), HEADLINE_OPTIONS
+            ).label("headline"),
+        ).order_by(ranked.c.rank.desc(), ranked.c.created_at.desc())
+    )
+
+    return {
+        "query": term,
+        "total": total,
+        "items": [
+            {
+                "id": row.id,
+                "headline": row.headline,
+                "rank": round(row.rank, 4),
+                "results": row.results,
+                "overall_confidence": row.overall_confidence,
+                "created_at": row.created_at,
+            }
+            for row in result.all()
+        ],
+    }
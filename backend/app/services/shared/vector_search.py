@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.llm import embeddings
+from app.core.vector import vector_param
 
 
 async def compute_embedding(text_input: str) -> list[float]:
@@ -17,8 +18,6 @@ async def search_similar_feedbacks(
     db: AsyncSession,
     top_k: int = settings.few_shot_top_k,
 ) -> list[dict]:
-    embedding_str = "[" + ",".join(str(v) for v in embedding) + "]"
-
     query = text("""
         SELECT
             cr.input_text,
@@ -39,12 +38,12 @@ async def search_similar_feedbacks(
             AND uf.corrected_category_id IS NOT NULL
         ORDER BY cr.embedding <=> :embedding
         LIMIT :top_k
-    """)
+    """).bindparams(vector_param("embedding"))
 
     result = await db.execute(
         query,
         {
-            "embedding": embedding_str,
+            "embedding": embedding,
             "config_id": str(config_id),
             "top_k": top_k,
         },
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.classification.classification_pipeline import classify_ticket
 from app.services.config.config_management import get_config_with_relations
 from app.services.learning.feedback_learning import store_feedback
+from app.services.learning.review_queue import refresh_review_queue
 
 TEXT_COLUMN_NAMES = {"text", "ticket", "message", "texte", "content", "description"}
 
@@ -76,6 +77,7 @@ async def import_tickets_from_csv(
 
     imported = 0
     skipped = 0
+    labelled = 0
     errors = []
 
     for row in rows:
@@ -112,12 +114,18 @@ async def import_tickets_from_csv(
                     reasoning_feedback="Import CSV ground-truth",
                     feedback_type="corrected",
                     db=db,
+                    refresh_queue=False,
                 )
+                labelled += 1
 
             imported += 1
         except Exception as exc:
             errors.append({"row": row_num, "reason": str(exc)})
 
+    if labelled:
+        await refresh_review_queue(config_id, db)
+        await db.commit()
+
     return {
         "total_rows": len(rows),
         "imported": imported,
@@ -0,0 +1,111 @@
+"""EXPLAIN regression checks for the explorer and ticket search filters.
+
+Builds the same predicates as the explorer and the ticket query builder, asks
+the planner for a plan with sequential scans disabled and fails if the
+expected index is not used. A predicate that stops matching its index (for
+example a category filter rewritten as a jsonb path expression instead of a
+containment) makes the check exit non-zero.
+
+The config_id filter is left out on purpose: whether the planner combines the
+GIN and HNSW indexes with ix_classif_config_created (or pre-filters on it and
+sorts exactly) depends on the data, whereas the point here is that the filter
+predicates and the distance ordering themselves stay indexable.
+
+Usage (from backend/, with DATABASE_URL pointing at a migrated database):
+    python -m benchmarks.explain_checks [--verbose]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.expression import ClauseElement
+
+from app.core.database import async_session
+from app.models.classification_result import ClassificationResult
+from app.schemas.llm_outputs import AxisFilter
+from app.services.analytics.ticket_query import _apply_axes_filters, _apply_text_search
+from app.services.shared.result_filters import category_condition
+
+PROBE_EMBEDDING = [1.0] + [0.0] * 1535
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _index_names(node: dict) -> set[str]:
+    names = {node["Index Name"]} if "Index Name" in node else set()
+    for child in node.get("Plans", []):
+        names |= _index_names(child)
+    return names
+
+
+def _checks() -> list[tuple[str, object, str]]:
+    base = select(ClassificationResult.id)
+    count = select(func.count()).select_from(ClassificationResult)
+    return [
+        (
+            "explorer: une categorie",
+            base.where(category_condition("Sujet", ["Facturation"])),
+            "ix_classif_results_path_ops",
+        ),
+        (
+            "explorer: categories en OU",
+            count.where(category_condition("Sujet", ["Facturation", "Livraison", "Compte"])),
+            "ix_classif_results_path_ops",
+        ),
+        (
+            "ticket query: axes combines",
+            _apply_axes_filters(base, [
+                AxisFilter(axis_name="Sujet", categories=["Facturation", "Livraison"]),
+                AxisFilter(axis_name="Sentiment", categories=["Negatif"]),
+            ]),
+            "ix_classif_results_path_ops",
+        ),
+        (
+            "ticket query: texte",
+            _apply_text_search(base, "remboursement facture"),
+            "ix_classif_search_vector",
+        ),
+        (
+            "recherche semantique: ANN",
+            base.order_by(ClassificationResult.embedding.cosine_distance(PROBE_EMBEDDING)).limit(20),
+            "ix_classif_embedding_hnsw",
+        ),
+    ]
+
+
+async def main(args: argparse.Namespace) -> int:
+    failures = 0
+    async with async_session() as db:
+        await db.execute(text("SET LOCAL enable_seqscan = off"))
+        for label, statement, expected_index in _checks():
+            raw_plan = (await db.execute(Explain(statement))).scalar_one()
+            plan = json.loads(raw_plan) if isinstance(raw_plan, str) else raw_plan
+            used = _index_names(plan[0]["Plan"])
+            ok = expected_index in used
+            failures += not ok
+            print(f"{'OK  ' if ok else 'FAIL'} {label:<32} attendu={expected_index} utilises={sorted(used)}")
+            if args.verbose or not ok:
+                print(json.dumps(plan[0]["Plan"], indent=2))
+        await db.rollback()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--verbose", action="store_true")
+    sys.exit(asyncio.run(main(parser.parse_args())))
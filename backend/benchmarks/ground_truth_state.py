@@ -0,0 +1,114 @@
+"""Ground-truth state benchmark: trajectory bookkeeping at 100 tickets x 15 rounds.
+
+Usage (from backend/): python -m benchmarks.ground_truth_state [tickets] [rounds]
+"""
+
+import random
+import sys
+import time
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from app.services.iterative_ground_truth.runner import (
+    _append_trajectories,
+    _build_trajectories,
+    _merge_by_id,
+    _should_continue,
+    _trajectory_entry,
+    _union,
+)
+
+
+def _result(cid: str, round_num: int) -> dict:
+    return {
+        "classification_id": cid,
+        "original_text": f"ticket {cid}",
+        "reformulated_text": f"ticket {cid} reformule au round {round_num} " * 4,
+        "confidence": random.random(),
+        "results_per_axis": [
+            {"axis_name": "Motif", "category_name": "Facturation", "confidence": 0.8}
+        ],
+        "used_fallback": False,
+        "error": None,
+    }
+
+
+def _legacy_trajectories(ticket_data: list[dict], all_round_results: list[list[dict]]) -> list[list[dict]]:
+    trajectories = []
+    for td in ticket_data:
+        rounds = []
+        for round_results in all_round_results:
+            for rr in round_results:
+                if rr["classification_id"] == td["classification_id"]:
+                    rounds.append(_trajectory_entry(rr))
+                    break
+        trajectories.append(rounds)
+    return trajectories
+
+
+def run(ticket_count: int = 100, rounds: int = 15) -> None:
+    random.seed(0)
+    serde = JsonPlusSerializer()
+    ticket_data = {
+        str(i): {
+            "classification_id": str(i),
+            "original_text": f"ticket {i}",
+            "current_text": f"ticket {i}",
+            "original_confidence": 0.4,
+        }
+        for i in range(ticket_count)
+    }
+    state = {
+        "ticket_data": ticket_data,
+        "frozen_ids": set(),
+        "frozen_results": {},
+        "trajectories": {},
+        "done_data": None,
+        "round_num": 1,
+        "max_rounds": rounds,
+    }
+    legacy_rounds: list[list[dict]] = []
+
+    started = time.perf_counter()
+    checkpoint_bytes = 0
+    for round_num in range(1, rounds + 1):
+        results = {
+            cid: state["frozen_results"].get(cid) or _result(cid, round_num)
+            for cid in ticket_data
+        }
+        legacy_rounds.append(list(results.values()))
+        state["trajectories"] = _append_trajectories(
+            state["trajectories"],
+            {cid: [_trajectory_entry(r)] for cid, r in results.items()},
+        )
+        newly_frozen = {
+            cid: r
+            for cid, r in results.items()
+            if cid not in state["frozen_ids"] and r["confidence"] > 0.97
+        }
+        state["frozen_ids"] = _union(state["frozen_ids"], set(newly_frozen))
+        state["frozen_results"] = _merge_by_id(state["frozen_results"], newly_frozen)
+        state["round_num"] = round_num + 1
+        _should_continue(state)
+        checkpoint_bytes += len(serde.dumps_typed(state)[1])
+    state_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    trajectories = _build_trajectories(ticket_data, state["trajectories"], 0.9)
+    build_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    legacy = _legacy_trajectories(list(ticket_data.values()), legacy_rounds)
+    legacy_time = time.perf_counter() - started
+
+    assert [t["rounds"] for t in trajectories] == legacy
+
+    print(f"tickets={ticket_count} rounds={rounds}")
+    print(f"state updates            {state_time * 1000:8.2f} ms")
+    print(f"checkpoint payload total {checkpoint_bytes / 1024:8.1f} KiB")
+    print(f"trajectories (id-keyed)  {build_time * 1000:8.2f} ms")
+    print(f"trajectories (list scan) {legacy_time * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    run(*(int(arg) for arg in sys.argv[1:3]))
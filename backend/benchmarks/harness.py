@@ -0,0 +1,127 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+from sqlalchemy import event
+
+from app.core.database import engine
+
+TICKET_TEMPLATES = [
+    "Bonjour, ma facture du mois de {mois} est fausse, je demande un remboursement de {montant} euros.",
+    "Je n'arrive plus a me connecter a mon espace client depuis {jours} jours, c'est urgent.",
+    "Merci pour la livraison rapide de ma commande {ref}, tout est parfait.",
+    "Le produit {ref} est arrive casse, je veux un echange au plus vite.",
+    "Pouvez-vous m'expliquer les frais de {montant} euros apparus sur mon releve de {mois} ?",
+    "Cela fait {jours} jours que j'attends une reponse, je suis extremement decu du service.",
+    "Je souhaite resilier mon abonnement avant le {jours} {mois}.",
+    "Votre nouvelle application est geniale mais il manque l'export de la commande {ref}.",
+]
+MONTHS = ["janvier", "fevrier", "mars", "avril", "mai", "juin"]
+
+
+def ticket_texts(count: int) -> list[str]:
+    return [
+        TICKET_TEMPLATES[i % len(TICKET_TEMPLATES)].format(
+            mois=MONTHS[i % len(MONTHS)],
+            montant=10 + (i * 7) % 190,
+            jours=2 + i % 12,
+            ref=f"CMD-{1000 + i}",
+        )
+        for i in range(count)
+    ]
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs) -> None:
+        self.count += 1
+
+    @contextmanager
+    def track(self):
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+        try:
+            yield self
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+
+@dataclass
+class ScenarioReport:
+    name: str
+    tickets: int
+    seconds: float
+    latency_unit: str
+    latencies_ms: list[float] = field(default_factory=list, repr=False)
+    queries: int = 0
+    errors: int = 0
+    peak_memory_mib: float = 0.0
+
+    @property
+    def tickets_per_second(self) -> float:
+        return self.tickets / self.seconds if self.seconds else 0.0
+
+    @property
+    def p50_ms(self) -> float:
+        return float(np.percentile(self.latencies_ms, 50)) if self.latencies_ms else 0.0
+
+    @property
+    def p95_ms(self) -> float:
+        return float(np.percentile(self.latencies_ms, 95)) if self.latencies_ms else 0.0
+
+    @property
+    def queries_per_ticket(self) -> float:
+        return self.queries / self.tickets if self.tickets else 0.0
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data.pop("latencies_ms")
+        data.update(
+            tickets_per_second=round(self.tickets_per_second, 2),
+            p50_ms=round(self.p50_ms, 1),
+            p95_ms=round(self.p95_ms, 1),
+            queries_per_ticket=round(self.queries_per_ticket, 1),
+        )
+        return data
+
+
+class Measurement:
+    def __init__(self, name: str, latency_unit: str = "ticket"):
+        self.report = ScenarioReport(name=name, tickets=0, seconds=0.0, latency_unit=latency_unit)
+        self._queries = QueryCounter()
+
+    def record(self, started: float) -> None:
+        self.report.latencies_ms.append((time.perf_counter() - started) * 1000)
+
+    @contextmanager
+    def run(self, tickets: int):
+        self.report.tickets = tickets
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            with self._queries.track():
+                yield self
+        finally:
+            self.report.seconds = time.perf_counter() - started
+            self.report.queries = self._queries.count
+            self.report.peak_memory_mib = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            tracemalloc.stop()
+
+
+def print_reports(reports: list[ScenarioReport], as_json: bool = False) -> None:
+    if as_json:
+        print(json.dumps([r.as_dict() for r in reports], indent=2))
+        return
+    header = f"{'scenario':<14}{'tickets':>8}{'sec':>9}{'tickets/s':>11}{'p50 ms':>10}{'p95 ms':>10}{'unit':>8}{'q/ticket':>10}{'peak MiB':>10}{'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in reports:
+        print(
+            f"{r.name:<14}{r.tickets:>8}{r.seconds:>9.2f}{r.tickets_per_second:>11.2f}"
+            f"{r.p50_ms:>10.1f}{r.p95_ms:>10.1f}{r.latency_unit:>8}"
+            f"{r.queries_per_ticket:>10.1f}{r.peak_memory_mib:>10.1f}{r.errors:>8}"
+        )
@@ -0,0 +1,176 @@
+"""End-to-end throughput benchmarks against the fake LLM backend.
+
+Runs classify, batch, CSV import and ground-truth scenarios on a throwaway
+config loaded from the support-client preset, then deletes it.
+
+Usage (from backend/, with DATABASE_URL pointing at a migrated database):
+    python -m benchmarks.llm_pipeline [scenario ...] [--tickets N] [--json]
+
+LLM_BACKEND defaults to "fake" here. FAKE_LLM_LATENCY_MS, FAKE_LLM_LATENCY_SIGMA,
+FAKE_LLM_ERROR_RATE and FAKE_EMBEDDING_LATENCY_MS shape the simulated calls.
+"""
+
+import os
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+
+import argparse
+import asyncio
+import io
+import time
+
+from fastapi import UploadFile
+from sqlalchemy import delete
+
+from app.core.database import async_session
+from app.services.classification.classification_pipeline import (
+    classify_batch,
+    classify_ticket,
+)
+from app.models.classification_result import ClassificationResult
+from app.models.config import Config
+from app.services.config.config_management import load_preset
+from app.services.iterative_ground_truth.checkpointer import (
+    close_checkpointer,
+    open_checkpointer,
+)
+from app.services.iterative_ground_truth.runner import run_ground_truth_loop
+from app.services.ticket_generation.csv_import import import_tickets_from_csv
+
+from .harness import Measurement, ScenarioReport, print_reports, ticket_texts
+
+SCENARIOS = ("classify", "batch", "csv", "ground_truth")
+
+
+async def bench_classify(config, texts: list[str], concurrency: int) -> ScenarioReport:
+    measurement = Measurement("classify")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _one(text: str) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                async with async_session() as db:
+                    await classify_ticket(text, config, db)
+            except Exception:
+                measurement.report.errors += 1
+            measurement.record(started)
+
+    with measurement.run(len(texts)):
+        await asyncio.gather(*(_one(t) for t in texts))
+    return measurement.report
+
+
+async def bench_batch(config, texts: list[str], batch_size: int) -> ScenarioReport:
+    measurement = Measurement("batch", latency_unit="batch")
+    with measurement.run(len(texts)):
+        for i in range(0, len(texts), batch_size):
+            started = time.perf_counter()
+            try:
+                async with async_session() as db:
+                    await classify_batch(texts[i : i + batch_size], config, db)
+            except Exception:
+                measurement.report.errors += 1
+            measurement.record(started)
+    return measurement.report
+
+
+async def bench_csv(config, texts: list[str], rows_per_file: int) -> ScenarioReport:
+    axis = sorted(config.axes, key=lambda a: a.position)[0]
+    categories = [c.name for c in axis.categories]
+    measurement = Measurement("csv", latency_unit="file")
+
+    with measurement.run(len(texts)):
+        for i in range(0, len(texts), rows_per_file):
+            lines = [f"texte;{axis.name}"]
+            for j, text in enumerate(texts[i : i + rows_per_file]):
+                lines.append(f"{text};{categories[(i + j) % len(categories)]}")
+            upload = UploadFile(
+                file=io.BytesIO("\n".join(lines).encode("utf-8")), filename="bench.csv"
+            )
+            started = time.perf_counter()
+            async with async_session() as db:
+                result = await import_tickets_from_csv(upload, config.id, db)
+            measurement.report.errors += result["errors"]
+            measurement.record(started)
+    return measurement.report
+
+
+async def bench_ground_truth(config, ticket_count: int, rounds: int) -> ScenarioReport:
+    measurement = Measurement("ground_truth", latency_unit="round")
+    classified = 0
+    round_started: dict[int, float] = {}
+
+    await open_checkpointer()
+    try:
+        with measurement.run(ticket_count):
+            async for item in run_ground_truth_loop(
+                config,
+                ticket_count=ticket_count,
+                max_rounds=rounds,
+                target_confidence=0.99,
+            ):
+                data = item.get("data", {})
+                if item["type"] == "round_start":
+                    round_started[data["round"]] = time.perf_counter()
+                elif item["type"] == "round_complete":
+                    measurement.record(round_started[data["round"]])
+                elif item["type"] == "ticket_result" and not data.get("frozen"):
+                    classified += 1
+                elif item["type"] in ("ticket_error", "round_error"):
+                    measurement.report.errors += 1
+                elif item["type"] == "error":
+                    raise RuntimeError(data.get("message"))
+    finally:
+        await close_checkpointer()
+
+    measurement.report.tickets = classified
+    return measurement.report
+
+
+async def main(args: argparse.Namespace) -> None:
+    texts = ticket_texts(args.tickets)
+    async with async_session() as db:
+        config = await load_preset("support-client", db)
+
+    reports = []
+    try:
+        for scenario in args.scenarios or SCENARIOS:
+            if scenario == "classify":
+                reports.append(await bench_classify(config, texts, args.concurrency))
+            elif scenario == "batch":
+                reports.append(await bench_batch(config, texts, args.batch_size))
+            elif scenario == "csv":
+                reports.append(await bench_csv(config, texts, args.batch_size))
+            elif scenario == "ground_truth":
+                if not reports:
+                    async with async_session() as db:
+                        await classify_batch(texts, config, db)
+                reports.append(
+                    await bench_ground_truth(config, args.tickets, args.rounds)
+                )
+    finally:
+        async with async_session() as db:
+            await db.execute(
+                delete(ClassificationResult).where(ClassificationResult.config_id == config.id)
+            )
+            await db.execute(delete(Config).where(Config.id == config.id))
+            await db.commit()
+
+    print_reports(reports, as_json=args.json)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", metavar="scenario", help=", ".join(SCENARIOS))
+    parser.add_argument("--tickets", type=int, default=40)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"scenarios inconnus : {', '.join(sorted(unknown))}")
+    asyncio.run(main(args))
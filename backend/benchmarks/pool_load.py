@@ -0,0 +1,154 @@
+"""Connection pool load test: ground truth, CSV import and API reads overlapping.
+
+Seeds a throwaway support-client config, then runs a ground-truth loop, a CSV
+import and a set of short API-style read workers at the same time, which is
+the situation that exhausts the pool in production. The pool is built from
+Settings, so compare runs by changing the environment:
+
+    DB_POOL_SIZE=5 DB_MAX_OVERFLOW=10 DB_POOL_TIMEOUT=5 python -m benchmarks.pool_load
+    DB_POOL_SIZE=10 DB_MAX_OVERFLOW=20 python -m benchmarks.pool_load
+    DB_STATEMENT_CACHE_SIZE=0 DB_POOL_PRE_PING=false python -m benchmarks.pool_load
+
+Query counts and peak memory are process-wide while the scenarios overlap.
+Pool timeouts show up as errors on the "api" row.
+"""
+
+import os
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import settings
+from app.core.database import async_session, engine
+from app.core.metrics import DB_POOL_WAIT_SECONDS
+from app.models.classification_result import ClassificationResult
+from app.models.config import Config
+from app.services.classification.classification_pipeline import classify_batch
+from app.services.config.config_management import load_preset
+
+from .harness import Measurement, ScenarioReport, print_reports, ticket_texts
+from .llm_pipeline import bench_csv, bench_ground_truth
+
+
+def _pool_wait_samples() -> dict[str, float]:
+    samples = {}
+    for sample in DB_POOL_WAIT_SECONDS.collect()[0].samples:
+        if sample.name.endswith("_bucket"):
+            samples[f"le_{sample.labels['le']}"] = sample.value
+        else:
+            samples[sample.name.rsplit("_", 1)[1]] = sample.value
+    return samples
+
+
+async def bench_api_reads(
+    config_id, workers: int, interval: float, done: asyncio.Event
+) -> ScenarioReport:
+    measurement = Measurement("api", latency_unit="request")
+    requests = 0
+
+    async def _worker() -> None:
+        nonlocal requests
+        while not done.is_set():
+            started = time.perf_counter()
+            try:
+                async with async_session() as db:
+                    await db.get(Config, config_id)
+                    await db.execute(
+                        select(func.count())
+                        .select_from(ClassificationResult)
+                        .where(ClassificationResult.config_id == config_id)
+                    )
+            except PoolTimeoutError:
+                measurement.report.errors += 1
+            measurement.record(started)
+            requests += 1
+            await asyncio.sleep(interval)
+
+    with measurement.run(0):
+        await asyncio.gather(*(_worker() for _ in range(workers)))
+    measurement.report.tickets = requests
+    return measurement.report
+
+
+async def sample_checked_out(done: asyncio.Event) -> int:
+    peak = 0
+    while not done.is_set():
+        peak = max(peak, engine.pool.checkedout())
+        await asyncio.sleep(0.005)
+    return peak
+
+
+async def main(args: argparse.Namespace) -> None:
+    texts = ticket_texts(args.tickets)
+    async with async_session() as db:
+        config = await load_preset("support-client", db)
+    async with async_session() as db:
+        await classify_batch(texts, config, db)
+
+    before = _pool_wait_samples()
+    done = asyncio.Event()
+
+    async def _workload() -> list[ScenarioReport]:
+        try:
+            return await asyncio.gather(
+                bench_ground_truth(config, args.tickets, args.rounds),
+                bench_csv(config, ticket_texts(args.csv_rows), args.batch_size),
+            )
+        finally:
+            done.set()
+
+    try:
+        reports, api_report, peak = await asyncio.gather(
+            _workload(),
+            bench_api_reads(config.id, args.api_workers, args.api_interval, done),
+            sample_checked_out(done),
+        )
+    finally:
+        async with async_session() as db:
+            await db.execute(
+                delete(ClassificationResult).where(ClassificationResult.config_id == config.id)
+            )
+            await db.execute(delete(Config).where(Config.id == config.id))
+            await db.commit()
+
+    after = _pool_wait_samples()
+    checkouts = after["count"] - before["count"]
+    pool = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pre_ping": settings.db_pool_pre_ping,
+        "statement_cache_size": settings.db_statement_cache_size,
+        "peak_checked_out": peak,
+        "checkouts": int(checkouts),
+        "mean_wait_ms": round((after["sum"] - before["sum"]) / checkouts * 1000, 2) if checkouts else 0.0,
+        "waits_over_100ms": int(checkouts - (after["le_0.1"] - before["le_0.1"])),
+    }
+    reports = [*reports, api_report]
+
+    if args.json:
+        print(json.dumps({"pool": pool, "scenarios": [r.as_dict() for r in reports]}, indent=2))
+        return
+    print_reports(reports)
+    print()
+    print("  ".join(f"{key}={value}" for key, value in pool.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--csv-rows", type=int, default=60)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--api-workers", type=int, default=20)
+    parser.add_argument("--api-interval", type=float, default=0.05)
+    parser.add_argument("--json", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,87 @@
+"""Regression checks for the rule-based ticket query parser.
+
+Runs fast_parse_ticket_query on an in-memory config and compares the parsed
+output with what the LLM parser is expected to return, so a pattern that
+silently stops matching (and falls through to a plain listing) is caught.
+No database or LLM is needed.
+
+Usage (from backend/):
+    python -m benchmarks.query_parser_checks
+"""
+
+import sys
+
+from app.models import Axis, AxisCategory, Config
+from app.services.analytics.ticket_query_parser import fast_parse_ticket_query
+
+
+def _config() -> Config:
+    return Config(
+        name="checks",
+        axes=[
+            Axis(name="Sujet", categories=[
+                AxisCategory(name="Facturation"),
+                AxisCategory(name="Livraison"),
+            ]),
+            Axis(name="Urgence", categories=[
+                AxisCategory(name="Haute"),
+                AxisCategory(name="Basse"),
+            ]),
+        ],
+    )
+
+
+CASES = [
+    (
+        "combien de tickets facturation",
+        {"aggregation": "count", "axes": {"Sujet": ["Facturation"]}},
+    ),
+    (
+        "Combien de tickets challenges cette semaine ?",
+        {"aggregation": "count", "was_challenged": True, "date_range": "last_week"},
+    ),
+    (
+        "tickets facturation urgence haute",
+        {"aggregation": None, "axes": {"Sujet": ["Facturation"], "Urgence": ["Haute"]}},
+    ),
+    (
+        "les 5 plus recents tickets livraison",
+        {"aggregation": None, "limit": 5, "sort": "created_at_desc"},
+    ),
+    ("tickets ou le client parle de combien il a paye", None),
+]
+
+
+def _actual(parsed, key):
+    if key == "axes":
+        return {f.axis_name: f.categories for f in parsed.filters.axes}
+    if hasattr(parsed, key):
+        return getattr(parsed, key)
+    return getattr(parsed.filters, key)
+
+
+def main() -> int:
+    config = _config()
+    failures = 0
+    for message, expected in CASES:
+        parsed = fast_parse_ticket_query(message, config)
+        if expected is None:
+            ok = parsed is None
+            detail = "" if ok else f"attendu=None obtenu={parsed}"
+        elif parsed is None:
+            ok, detail = False, "attendu un filtre, obtenu=None"
+        else:
+            mismatches = {
+                key: (value, _actual(parsed, key))
+                for key, value in expected.items()
+                if _actual(parsed, key) != value
+            }
+            ok = not mismatches
+            detail = "" if ok else f"ecarts={mismatches}"
+        failures += not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {message!r} {detail}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""add review queue
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "003"
+down_revision = "002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "review_queue_items",
+        sa.Column("classification_id", UUID(as_uuid=True), sa.ForeignKey("classification_results.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("config_id", UUID(as_uuid=True), sa.ForeignKey("configs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("priority_score", sa.Float(), nullable=False),
+        sa.Column("claimed_by", sa.String(100), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_review_queue_config_priority", "review_queue_items", ["config_id", "priority_score"])
+
+    op.execute("""
+        WITH feedback_totals AS (
+            SELECT cr.config_id, count(*) AS n
+            FROM user_feedbacks uf
+            JOIN classification_results cr ON cr.id = uf.classification_id
+            WHERE uf.active = true
+            GROUP BY cr.config_id
+        ),
+        category_feedbacks AS (
+            SELECT ax.config_id, ax.name AS axis_name, ac.name AS category_name, count(*) AS cnt
+            FROM user_feedbacks uf
+            JOIN axes ax ON ax.id = uf.axis_id
+            JOIN axes_categories ac ON ac.id = uf.corrected_category_id
+            WHERE uf.active = true
+            GROUP BY ax.config_id, ax.name, ac.name
+        ),
+        pool AS (
+            SELECT
+                cr.id,
+                cr.config_id,
+                1.0 - cr.overall_confidence AS confidence_score,
+                CASE WHEN cr.was_challenged THEN 1.0 ELSE 0.0 END AS challenged_score,
+                COALESCE((
+                    SELECT avg(CASE
+                        WHEN COALESCE((v ->> 'empirical_confidence')::float, 1.0) < 1.0
+                        THEN 1.0 ELSE 0.0 END)
+                    FROM jsonb_array_elements(
+                        CASE WHEN jsonb_typeof(cr.vote_details -> 'results_per_axis') = 'array'
+                        THEN cr.vote_details -> 'results_per_axis' ELSE '[]'::jsonb END
+                    ) v
+                ), 0.0) AS disagreement_score,
+                COALESCE((
+                    SELECT avg(1.0 / (1 + COALESCE(cf.cnt, 0)))
+                    FROM jsonb_array_elements(
+                        CASE WHEN jsonb_typeof(cr.results) = 'array'
+                        THEN cr.results ELSE '[]'::jsonb END
+                    ) r
+                    LEFT JOIN category_feedbacks cf
+                        ON cf.config_id = cr.config_id
+                        AND cf.axis_name = COALESCE(r ->> 'axis_name', '')
+                        AND cf.category_name = COALESCE(r ->> 'category_name', '')
+                ), 0.0) AS rarity_score
+            FROM classification_results cr
+            WHERE NOT EXISTS (
+                SELECT 1 FROM user_feedbacks uf WHERE uf.classification_id = cr.id
+            )
+        )
+        INSERT INTO review_queue_items (classification_id, config_id, priority_score)
+        SELECT
+            pool.id,
+            pool.config_id,
+            round(LEAST(1.0, GREATEST(0.0, CASE
+                WHEN COALESCE(ft.n, 0) < 30 THEN
+                    rarity_score * 0.35 + confidence_score * 0.25
+                    + challenged_score * 0.20 + disagreement_score * 0.15 + 0.025
+                ELSE
+                    disagreement_score * 0.30 + confidence_score * 0.25
+                    + rarity_score * 0.20 + challenged_score * 0.15 + 0.05
+            END))::numeric, 3)::float
+        FROM pool
+        LEFT JOIN feedback_totals ft ON ft.config_id = pool.config_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_review_queue_config_priority", table_name="review_queue_items")
+    op.drop_table("review_queue_items")
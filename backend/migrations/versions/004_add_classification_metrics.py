@@ -0,0 +1,26 @@
+"""add classification metrics
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "004"
+down_revision = "003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "classification_results",
+        sa.Column("metrics", JSONB(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("classification_results", "metrics")
@@ -0,0 +1,44 @@
+"""add conversation summary and message token counts
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "005"
+down_revision = "004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("conversations", sa.Column("summary", sa.Text(), nullable=True))
+    op.add_column(
+        "conversations",
+        sa.Column("summarized_until", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    op.add_column(
+        "chat_messages",
+        sa.Column("token_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute("UPDATE chat_messages SET token_count = greatest(1, length(content) / 4)")
+
+    op.drop_index("ix_chat_messages_conversation", table_name="chat_messages")
+    op.create_index(
+        "ix_chat_messages_conversation",
+        "chat_messages",
+        ["conversation_id", "created_at"],
+        postgresql_include=["id", "token_count"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chat_messages_conversation", table_name="chat_messages")
+    op.create_index("ix_chat_messages_conversation", "chat_messages", ["conversation_id", "created_at"])
+    op.drop_column("chat_messages", "token_count")
+    op.drop_column("conversations", "summarized_until")
+    op.drop_column("conversations", "summary")
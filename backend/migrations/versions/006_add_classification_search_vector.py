@@ -0,0 +1,32 @@
+"""add full-text search vector on classification input text
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "006"
+down_revision = "005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE classification_results
+        ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('french', coalesce(input_text, ''))) STORED
+    """)
+    op.create_index(
+        "ix_classif_search_vector",
+        "classification_results",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_classif_search_vector", table_name="classification_results")
+    op.drop_column("classification_results", "search_vector")
@@ -0,0 +1,27 @@
+"""add GIN index on classification results for category containment filters
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "007"
+down_revision = "006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_classif_results_path_ops",
+        "classification_results",
+        ["results"],
+        postgresql_using="gin",
+        postgresql_ops={"results": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_classif_results_path_ops", table_name="classification_results")
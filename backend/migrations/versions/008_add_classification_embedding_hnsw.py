@@ -0,0 +1,27 @@
+"""add HNSW cosine index on classification embeddings
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "008"
+down_revision = "007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_classif_embedding_hnsw",
+        "classification_results",
+        ["embedding"],
+        postgresql_using="hnsw",
+        postgresql_ops={"embedding": "vector_cosine_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_classif_embedding_hnsw", table_name="classification_results")
@@ -26,6 +26,7 @@ export function GroundTruthLoop() {
     currentPhase,
     launch,
     stop,
+    cancel,
     reset,
   } = useGroundTruthSSE(currentConfigId);
 
@@ -66,6 +67,7 @@ export function GroundTruthLoop() {
           aboveThreshold={aboveThreshold}
           ticketCount={tickets.length}
           onStop={stop}
+          onCancel={cancel}
         />
       )}
 
@@ -1,6 +1,6 @@
 "use client";
 
-import { Loader2, Square } from "lucide-react";
+import { Loader2, Square, Unplug } from "lucide-react";
 import type { PhaseState } from "@/hooks/useGroundTruthSSE";
 
 interface LiveStatusBarProps {
@@ -11,6 +11,7 @@ interface LiveStatusBarProps {
   aboveThreshold: number;
   ticketCount: number;
   onStop: () => void;
+  onCancel: () => void;
 }
 
 function getPhaseLabel(phase: PhaseState | null): string {
@@ -47,6 +48,7 @@ export function LiveStatusBar({
   aboveThreshold,
   ticketCount,
   onStop,
+  onCancel,
 }: LiveStatusBarProps) {
   return (
     <div className="rounded-xl border border-border bg-card p-6 shadow-sm">
@@ -62,13 +64,22 @@ export function LiveStatusBar({
             </p>
           </div>
         </div>
-        <button
-          onClick={onStop}
-          className="inline-flex items-center gap-1.5 rounded-md border border-destructive/30 bg-destructive/5 px-3 py-1.5 text-xs font-medium text-destructive transition-colors hover:bg-destructive/10"
-        >
-          <Square className="h-3 w-3" />
-          Arreter
-        </button>
+        <div className="flex items-center gap-2">
+          <button
+            onClick={onStop}
+            className="inline-flex items-center gap-1.5 rounded-md border border-border px-3 py-1.5 text-xs font-medium text-muted-foreground transition-colors hover:bg-muted"
+          >
+            <Unplug className="h-3 w-3" />
+            Se deconnecter
+          </button>
+          <button
+            onClick={onCancel}
+            className="inline-flex items-center gap-1.5 rounded-md border border-destructive/30 bg-destructive/5 px-3 py-1.5 text-xs font-medium text-destructive transition-colors hover:bg-destructive/10"
+          >
+            <Square className="h-3 w-3" />
+            Annuler le run
+          </button>
+        </div>
       </div>
 
       <div className="h-1.5 overflow-hidden rounded-full bg-muted">
@@ -64,6 +64,7 @@ export function useGroundTruthSSE(configId: string | null) {
   const [effectiveMax, setEffectiveMax] = useState(5);
 
   const abortRef = useRef<AbortController | null>(null);
+  const runIdRef = useRef<string | null>(null);
 
   const launch = useCallback(
     async (config: GroundTruthConfig) => {
@@ -81,6 +82,7 @@ export function useGroundTruthSSE(configId: string | null) {
 
       const abort = new AbortController();
       abortRef.current = abort;
+      runIdRef.current = null;
 
       try {
         const res = await fetch(`${API_BASE}/api/evaluate/ground-truth`, {
@@ -133,6 +135,7 @@ export function useGroundTruthSSE(configId: string | null) {
             }
 
             if (eventType === "init") {
+              runIdRef.current = (parsed.run_id as string | undefined) ?? null;
               const initTickets = (
                 parsed.tickets as {
                   classification_id: string;
@@ -266,7 +269,18 @@ export function useGroundTruthSSE(configId: string | null) {
   const stop = useCallback(() => {
     abortRef.current?.abort();
     setStatus("done");
-    setDoneMessage("Arrete par l'utilisateur");
+    setDoneMessage("Deconnecte du run (il continue cote serveur)");
+  }, []);
+
+  const cancel = useCallback(() => {
+    abortRef.current?.abort();
+    if (runIdRef.current) {
+      fetch(`${API_BASE}/api/evaluate/ground-truth/${runIdRef.current}/cancel`, {
+        method: "POST",
+      }).catch(() => {});
+    }
+    setStatus("done");
+    setDoneMessage("Run annule par l'utilisateur");
   }, []);
 
   const reset = useCallback(() => {
@@ -286,6 +300,7 @@ export function useGroundTruthSSE(configId: string | null) {
     currentPhase,
     launch,
     stop,
+    cancel,
     reset,
   };
 }